@@ -1,5 +1,4 @@
 #!/usr/bin/env python3
-"""SnippetMaster - A minimal GUI frontend for Espanso"""
 """
 SnippetMaster
 ───────────────────────────────
@@ -13,138 +12,552 @@ Features:
 - Filter snippets by source file.
 - Sort snippets alphabetically.
 - Open folder location for snippet files.
-- NEW: Create new snippet files/collections.
-- NEW: Move snippets between files.
-- NEW: Import external YAML files.
-- NEW: Export/copy files for sharing.
+- Create new snippet files/collections.
+- Move snippets between files.
+- Import external YAML files.
+- Export/copy files for sharing.
 
 Requirements:
 1. Espanso installed.
-2. Python dependencies: `pip install flask ruamel.yaml`
+2. Python dependencies: `pip install flask ruamel.yaml pyyaml`
+3. Optional accelerators: `pip install orjson waitress`
 
 Usage:
-Run "python SnippetMaster.py" and it will open your browser automatically.
-"#!/usr/bin/env python3
-"""SnippetMaster - A minimal GUI frontend for Espanso"""
+Run "python snippetmaster.py" and it will open your browser automatically.
 """
-SnippetMaster
-───────────────────────────────
-A minimal Espanso web-GUI.
-
-Features:
-- View, Create, Edit, and Delete snippets.
-- Supports standard Text replacements (`replace`) and Markdown (`markdown`).
-- Toggles for 'Whole Word' and 'Case Propagation'.
-- Auto-detects Espanso configuration directory (Windows/macOS/Linux).
-- Filter snippets by source file.
-- Sort snippets alphabetically.
-- Open folder location for snippet files.
-- NEW: Create new snippet files/collections.
-- NEW: Move snippets between files.
-- NEW: Import external YAML files.
-- NEW: Export/copy files for sharing.
-
-Requirements:
-1. Espanso installed.
-2. Python dependencies: `pip install flask ruamel.yaml`
-
-Usage:
-Run "python SnippetMaster.py" and it will open your browser automatically.
-"""
-import os, sys, webbrowser, subprocess, shutil
+import gzip, hashlib, json, os, re, sys
+from array import array
+from codecs import BOM_UTF8
+from io import BytesIO, StringIO
+from operator import itemgetter
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from threading import Timer
+from threading import Thread
+from urllib.parse import unquote
 from datetime import datetime
-from flask import Flask, render_template_string, request, redirect, url_for, jsonify, send_file
+from flask import Flask, request, redirect, url_for, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+from markupsafe import Markup
 from ruamel.yaml import YAML
-from werkzeug.utils import secure_filename
+import yaml as pyyaml
+
+try:
+    import orjson  # optional: C JSON encoder, used when available
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode("utf-8")
+else:
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
 
 app = Flask(__name__)
+
+if orjson is not None:
+    # Route jsonify()/get_json() through orjson when it is installed;
+    # the stdlib encoder remains the fallback.
+    class _OrjsonProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode("utf-8")
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = _OrjsonProvider(app)
+
 yaml = YAML()
 yaml.preserve_quotes = True
 yaml.indent(mapping=2, sequence=4, offset=2)
 
+# Fast loader for read-only paths. PyYAML's libyaml-backed CSafeLoader is an
+# order of magnitude faster than ruamel's round-trip mode; we only need ruamel
+# (quote/indent preservation) when we write files back.
+try:
+    _FAST_LOADER = pyyaml.CSafeLoader
+    _FAST_DUMPER = pyyaml.CSafeDumper
+except AttributeError:  # libyaml not available
+    _FAST_LOADER = pyyaml.SafeLoader
+    _FAST_DUMPER = pyyaml.SafeDumper
+    print("libyaml not available; falling back to the pure-Python YAML parser")
+
+def _fast_load(path):
+    """Parse a YAML file for reading only (no round-trip formatting info)."""
+    try:
+        with open(path, "rb") as fp:
+            return pyyaml.load(fp, Loader=_FAST_LOADER)
+    except Exception:
+        # Fall back to ruamel, which is more forgiving about odd constructs.
+        with open(path, "rb") as fp:
+            return yaml.load(fp)
+
+def _fast_dump(data, path):
+    """Write programmatically-built YAML; nothing round-trip to preserve."""
+    with open(path, "w", encoding="utf-8") as fp:
+        pyyaml.dump(data, fp, Dumper=_FAST_DUMPER, sort_keys=False,
+                    allow_unicode=True, default_flow_style=False, indent=2)
+
+# Parsed-file cache so a warm page load doesn't re-parse an unchanged match
+# tree. Keyed by path; entries are reused while mtime and size still match,
+# and writers drop the entry for any file they touch. Callers must treat the
+# cached document as read-only.
+_PARSE_CACHE = {}  # str(path) -> (st_mtime_ns, st_size, parsed document)
+
+_SNIFF_BYTES = 4096
+
+def _sniff_matches(path, size):
+    """Cheap header check: can this file contain a top-level 'matches:' key?
+
+    Files without one (private config, comments-only, _underscore files)
+    don't deserve a full YAML parse. Only conclusive when the whole file
+    fits in the sniffed window.
+    """
+    try:
+        with open(path, "rb") as fp:
+            head = fp.read(_SNIFF_BYTES)
+    except OSError:
+        return True
+    # BOM-saving editors are common on Windows; the marker would otherwise
+    # hide a leading 'matches:' from the check.
+    head = head.removeprefix(BOM_UTF8)
+    if b"\nmatches:" in b"\n" + head:
+        return True
+    return size > _SNIFF_BYTES
+
+def _cached_load(path, stat_result=None, sniff=False):
+    """Like _fast_load, but reuses the parse while the file is unchanged."""
+    key = str(path)
+    st = stat_result if stat_result is not None else os.stat(key)
+    hit = _PARSE_CACHE.get(key)
+    if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
+    if sniff and not _sniff_matches(key, st.st_size):
+        data = None
+    else:
+        data = _fast_load(key)
+    _PARSE_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+def _invalidate_cache(path):
+    """Drop the cached parse (and derived caches) for a file we just wrote."""
+    key = str(path)
+    _PARSE_CACHE.pop(key, None)
+    _SHARD_CACHE.pop(key, None)
+    _STORE_CACHE["sig"] = None
+
+_IS_WIN = sys.platform == "win32"
+
 def get_match_dir():
-    if sys.platform == "win32":
+    if _IS_WIN:
         return Path(os.environ.get("APPDATA", "")) / "espanso" / "match"
     return Path.home() / ".config" / "espanso" / "match"
 
 MATCH_DIR = get_match_dir()
+MATCH_DIR_STR = str(MATCH_DIR)
 
 def ensure_absolute_path(path_str):
-    if sys.platform != "win32" and not path_str.startswith('/'):
+    if not _IS_WIN and not path_str.startswith('/'):
         return '/' + path_str
     return path_str
 
+@lru_cache(maxsize=4096)
 def get_file_label(filepath):
     """Extract meaningful label - use parent folder name if file is named 'package.yml'"""
-    path = Path(filepath)
-    if path.stem.lower() == "package":
-        return path.parent.name
-    return path.stem
+    filepath = os.fspath(filepath)
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    if stem.lower() == "package":
+        return os.path.basename(os.path.dirname(filepath))
+    return stem
+
+def _iter_yml(root):
+    """Yield os.DirEntry objects for every .yml file under root.
+
+    scandir reuses the directory entry's type information instead of an extra
+    stat() per path the way Path.glob does, and avoids building Path objects
+    for files nobody asked about. Symlinks are skipped. Raises OSError when
+    root itself can't be opened, so callers don't need a separate exists()
+    stat before walking.
+    """
+    stack = [str(root)]
+    at_root = True
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            if at_root:
+                raise
+            continue
+        at_root = False
+        with it:
+            for e in it:
+                try:
+                    if e.is_symlink():
+                        continue
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    elif e.name.endswith(".yml") and e.is_file(follow_symlinks=False):
+                        yield e
+                except OSError:
+                    continue
+
+# Flag bits packed per snippet instead of three bools per dict.
+_F_WORD = 1
+_F_CASE = 2
+_F_MD = 4
+
+class _SnippetView:
+    """Lightweight attribute view over one row of a SnippetStore."""
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    @property
+    def file(self): return self._store.files[self._store.file_idx[self._row]]
+
+    @property
+    def file_label(self): return self._store.file_labels[self._store.file_idx[self._row]]
+
+    @property
+    def index(self): return self._row - self._store.file_start[self._store.file_idx[self._row]]
+
+    @property
+    def id(self): return f"{self.file}::{self.index}"
+
+    @property
+    def trigger(self): return self._store.triggers[self._row]
+
+    @property
+    def preview(self): return self._store.previews[self._row]
+
+    @property
+    def replace(self):
+        """Full replacement body, re-read from the parsed file on demand.
+
+        Only the edit view needs it; the list view runs off the truncated
+        preview column, so multi-KB bodies never sit in the store. The read
+        is almost always a parse-cache hit.
+        """
+        try:
+            data = _cached_load(self.file)
+        except OSError:
+            return self.preview
+        matches = data.get("matches") if isinstance(data, dict) else None
+        if matches and self.index < len(matches):
+            m = matches[self.index]
+            if isinstance(m, dict):
+                value = m["markdown"] if "markdown" in m else m.get("replace", "")
+                if not isinstance(value, str):
+                    value = str(value)
+                return value
+        return self.preview
+
+    @property
+    def word(self): return bool(self._store.flags[self._row] & _F_WORD)
+
+    @property
+    def propagate_case(self): return bool(self._store.flags[self._row] & _F_CASE)
+
+    @property
+    def is_markdown(self): return bool(self._store.flags[self._row] & _F_MD)
+
+@lru_cache(maxsize=512)
+def _relative_label(path_str):
+    """Path shown in the UI: relative to MATCH_DIR when inside it.
+
+    A plain prefix slice replaces Path construction plus relative_to,
+    which re-split the string on every call; the cache keeps the few
+    repeating paths free either way.
+    """
+    prefix = MATCH_DIR_STR + os.sep
+    return path_str[len(prefix):] if path_str.startswith(prefix) else path_str
+
+class SnippetStore:
+    """Column-oriented snippet collection.
+
+    Instead of one 9-key dict per match (which duplicates the file path and
+    label for every snippet in a file), snippets live in parallel columns
+    with per-file data stored once. Ids stay '<file>::<index>' and decode to
+    a row in O(1) via the per-file start offsets.
+
+    The external id deliberately embeds the path rather than a packed
+    (file_id, match_idx) integer: small ids would be cheaper to ship, but
+    file ids shift whenever a collection is added or removed, so a stale
+    link could silently edit the wrong file. With path ids, staleness is
+    confined to the index within one file, and id strings are only built
+    lazily for rows that actually get rendered.
+    """
+    __slots__ = ("files", "file_labels", "file_start", "file_idx",
+                 "triggers", "previews", "flags", "_file_rows")
+
+    def __init__(self):
+        self.files = []        # per file: path string
+        self.file_labels = []  # per file: display label
+        self.file_start = []   # per file: row of its first snippet
+        self.file_idx = array("I")  # per snippet: index into files
+        self.triggers = []
+        self.previews = []  # first line of the body, truncated
+        self.flags = array("B")
+        self._file_rows = {}   # path -> index into files
+
+    def add_file(self, path, label, matches):
+        fidx = len(self.files)
+        self.files.append(path)
+        self.file_labels.append(label)
+        self.file_start.append(len(self.triggers))
+        self._file_rows[path] = fidx
+        for m in matches:
+            if "markdown" in m:
+                entry_replace = m["markdown"]
+                flags = _F_MD
+            else:
+                entry_replace = m.get("replace", "")
+                flags = 0
+            if not isinstance(entry_replace, str):
+                entry_replace = str(entry_replace)
+            if m.get("word", False): flags |= _F_WORD
+            if m.get("propagate_case", False): flags |= _F_CASE
+            self.file_idx.append(fidx)
+            self.triggers.append(m.get("trigger", ""))
+            # find + slice instead of split: no copy of the (possibly
+            # large) remainder of a multi-line body.
+            nl = entry_replace.find("\n", 0, 300)
+            self.previews.append(entry_replace[:300 if nl < 0 else nl])
+            self.flags.append(flags)
+
+    def __len__(self):
+        return len(self.triggers)
+
+    def __iter__(self):
+        for row in range(len(self.triggers)):
+            yield _SnippetView(self, row)
+
+    def _file_end(self, fidx):
+        if fidx + 1 < len(self.file_start):
+            return self.file_start[fidx + 1]
+        return len(self.triggers)
+
+    def unique_files(self):
+        """One {path, label, relative} dict per source file, sorted by label."""
+        # Decorate-sort-undecorate so each label is lowercased once instead
+        # of on every comparison.
+        decorated = sorted((label.lower(), path, label)
+                           for path, label in zip(self.files, self.file_labels))
+        return [{"path": path, "label": label, "relative": _relative_label(path)}
+                for _, path, label in decorated]
+
+    def lookup(self, snippet_id):
+        """Decode '<file>::<index>' to a view, or None if unknown."""
+        try:
+            filepath, index = snippet_id.rsplit("::", 1)
+            index = int(index)
+        except ValueError:
+            return None
+        fidx = self._file_rows.get(filepath)
+        if fidx is None or index < 0:
+            return None
+        row = self.file_start[fidx] + index
+        if row >= self._file_end(fidx):
+            return None
+        return _SnippetView(self, row)
+
+_PARSE_WORKERS = min(8, os.cpu_count() or 1)
+
+def _parse_one(job):
+    """Parse-pool worker: sniff + parse one cache-miss file."""
+    path, st = job
+    try:
+        if not _sniff_matches(path, st.st_size):
+            return None
+        return _fast_load(path)
+    except Exception as e:
+        print(f"Error loading {path}: {e}")
+        return None
+
+# Whole-store cache on top of the per-file parse cache: when the stat
+# signature of the match tree is unchanged, a page load reuses the
+# previously built SnippetStore outright — N stat() calls, no column
+# rebuilding. Writers reset the signature via _invalidate_cache.
+_STORE_CACHE = {"sig": None, "store": None}
 
 def load_snippets():
-    snippets = []
-    if not MATCH_DIR.exists():
-        return snippets, False
-    for f in MATCH_DIR.glob("**/*.yml"):
+    store = SnippetStore()
+    try:
+        entries = sorted(_iter_yml(MATCH_DIR_STR), key=lambda e: e.path)
+    except OSError:
+        return store, False
+
+    stats = []
+    for entry in entries:
         try:
-            with open(f, "r", encoding="utf-8") as fp:
-                data = yaml.load(fp)
-            if data and "matches" in data:
-                for i, m in enumerate(data["matches"]):
-                    is_markdown = False
-                    entry_replace = ""
-
-                    if "markdown" in m:
-                        entry_replace = m["markdown"]
-                        is_markdown = True
-                    else:
-                        entry_replace = m.get("replace", "")
-
-                    if not isinstance(entry_replace, str):
-                        entry_replace = str(entry_replace)
-
-                    snippets.append({
-                        "id": f"{f}::{i}",
-                        "file": str(f),
-                        "file_label": get_file_label(f),
-                        "index": i,
-                        "trigger": m.get("trigger", ""),
-                        "replace": entry_replace,
-                        "word": m.get("word", False),
-                        "propagate_case": m.get("propagate_case", False),
-                        "is_markdown": is_markdown
-                    })
-        except Exception as e:
-            print(f"Error loading {f}: {e}")
-    return snippets, True
+            stats.append((entry, entry.stat()))
+        except OSError:
+            continue
+
+    sig = tuple((entry.path, st.st_mtime_ns, st.st_size) for entry, st in stats)
+    if sig == _STORE_CACHE["sig"]:
+        return _STORE_CACHE["store"], True
+
+    # Parse only the cache misses, and do those in parallel: libyaml does
+    # its work outside the GIL, so a small thread pool scales with cores.
+    pending = []
+    for entry, st in stats:
+        hit = _PARSE_CACHE.get(entry.path)
+        if hit is None or hit[0] != st.st_mtime_ns or hit[1] != st.st_size:
+            pending.append((entry.path, st))
+    if len(pending) > 1 and _PARSE_WORKERS > 1:
+        with ThreadPoolExecutor(max_workers=_PARSE_WORKERS) as ex:
+            parsed = list(ex.map(_parse_one, pending))
+    else:
+        parsed = [_parse_one(job) for job in pending]
+    for (path, st), data in zip(pending, parsed):
+        _PARSE_CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+
+    # Garbage-collect cache entries for files that no longer exist. Stale
+    # entries for existing files already self-invalidate via the stat
+    # compare above, so new writers are covered even if they forget to call
+    # _invalidate_cache (the explicit pops stay as a guard for filesystems
+    # with coarse mtime granularity).
+    seen = {entry.path for entry in entries}
+    for key in list(_PARSE_CACHE):
+        if key not in seen:
+            del _PARSE_CACHE[key]
+            _SHARD_CACHE.pop(key, None)
+
+    for entry, _ in stats:
+        hit = _PARSE_CACHE.get(entry.path)
+        data = hit[2] if hit else None
+        if data and "matches" in data:
+            try:
+                store.add_file(entry.path, get_file_label(entry.path), data["matches"])
+            except Exception as e:
+                print(f"Error loading {entry.path}: {e}")
+    _STORE_CACHE["sig"] = sig
+    _STORE_CACHE["store"] = store
+    return store, True
 
 def get_yaml_files():
     """Get list of all YAML files in match directory"""
     files = []
-    if MATCH_DIR.exists():
-        for f in MATCH_DIR.glob("**/*.yml"):
+    try:
+        for entry in _iter_yml(MATCH_DIR_STR):
+            label = get_file_label(entry.path)
             files.append({
-                "path": str(f),
-                "label": get_file_label(f),
-                "relative": str(f.relative_to(MATCH_DIR))
+                "path": entry.path,
+                "label": label,
+                # The walk is rooted at MATCH_DIR_STR, so the relative
+                # part is a plain prefix slice; relpath would re-split
+                # and re-join both paths per entry.
+                "relative": entry.path[len(MATCH_DIR_STR) + 1:],
+                "_k": label.lower()
             })
-    return sorted(files, key=lambda x: x["label"].lower())
+    except OSError:
+        return files
+    files.sort(key=itemgetter("_k"))
+    return files
+
+def _patch_match_span(filepath, index, entry, keep_nonempty=False):
+    """Rewrite one entry of the top-level matches list in place.
+
+    Locates the entry's line span via YAML node marks and splices in a
+    freshly-dumped entry (None removes it), leaving the rest of the file
+    byte-identical. The patched text is re-parsed and checked before the
+    file is touched; returns False whenever patching isn't provably safe,
+    so callers fall back to the full load-mutate-dump path.
+    """
+    try:
+        text = Path(filepath).read_text(encoding="utf-8")
+        root = pyyaml.compose(text, Loader=pyyaml.SafeLoader)
+        if not isinstance(root, pyyaml.nodes.MappingNode):
+            return False
+        seq = next((v for k, v in root.value if getattr(k, "value", None) == "matches"), None)
+        if not isinstance(seq, pyyaml.nodes.SequenceNode):
+            return False
+        items = seq.value
+        if index >= len(items) or (keep_nonempty and entry is None and len(items) <= 1):
+            return False
+
+        def line_start(pos):
+            return text.rfind("\n", 0, pos) + 1
+
+        start = line_start(items[index].start_mark.index)
+        if index + 1 < len(items):
+            end = line_start(items[index + 1].start_mark.index)
+        else:
+            end = seq.end_mark.index
+        # Clamp the span to the line after the entry's last scalar: the
+        # gap up to the next entry (or the sequence end) holds only blank
+        # and comment lines, which are invisible to the reparse check and
+        # must not be spliced away with the entry. Collection end marks
+        # can't be used directly because the scanner skips comments before
+        # placing them, so descend to the entry's final leaf node.
+        tail = items[index]
+        while isinstance(tail, pyyaml.nodes.CollectionNode) and tail.value:
+            last = tail.value[-1]
+            tail = last[1] if isinstance(tail, pyyaml.nodes.MappingNode) else last
+        entry_end = tail.end_mark.index
+        if entry_end and text[entry_end - 1] == "\n":
+            own_end = entry_end
+        else:
+            nl = text.find("\n", entry_end)
+            own_end = len(text) if nl == -1 else nl + 1
+        if end > own_end:
+            end = own_end
+        # The entry's dash must be the only thing before it on the line;
+        # flow style or exotic layouts are left to the full rewrite.
+        prefix = text[start:items[index].start_mark.index]
+        dash = prefix.find("-")
+        if dash == -1 or prefix[:dash].strip() or prefix[dash + 1:].strip():
+            return False
+
+        if entry is None:
+            replacement = ""
+        else:
+            buf = StringIO()
+            yaml.dump([entry], buf)
+            dumped = buf.getvalue()
+            d_dash = dumped.find("-")
+            if d_dash == -1:
+                return False
+            shift = dash - d_dash
+            lines = []
+            for ln in dumped.splitlines():
+                if not ln.strip():
+                    lines.append("")
+                elif shift >= 0:
+                    lines.append(" " * shift + ln)
+                elif ln[:-shift].strip() == "":
+                    lines.append(ln[-shift:])
+                else:
+                    return False
+            replacement = "\n".join(lines) + "\n"
+
+        patched = text[:start] + replacement + text[end:]
+
+        # Verify before writing: the patch must change exactly one entry.
+        reparsed = pyyaml.load(patched, Loader=_FAST_LOADER)
+        matches = reparsed.get("matches") if isinstance(reparsed, dict) else None
+        expected = len(items) - (1 if entry is None else 0)
+        if not isinstance(matches, list) or len(matches) != expected:
+            return False
+        if entry is not None and matches[index] != entry:
+            return False
+
+        Path(filepath).write_text(patched, encoding="utf-8")
+        _invalidate_cache(filepath)
+        return True
+    except Exception:
+        return False
 
 def save_snippet(filepath, index, trigger, replace, word, pcase, is_markdown, is_new=False):
     filepath = Path(filepath)
     filepath.parent.mkdir(parents=True, exist_ok=True)
 
-    data = {}
-    if filepath.exists():
-        with open(filepath, "r", encoding="utf-8") as f:
-            loaded = yaml.load(f)
-            data = loaded if isinstance(loaded, dict) else {}
-
-    if "matches" not in data:
-        data["matches"] = []
-
     entry = {"trigger": trigger}
 
     if is_markdown:
@@ -155,6 +568,40 @@ def save_snippet(filepath, index, trigger, replace, word, pcase, is_markdown, is
     if word: entry["word"] = True
     if pcase: entry["propagate_case"] = True
 
+    if is_new and not filepath.exists():
+        # Brand-new file: nothing to load and no formatting to preserve,
+        # so skip ruamel entirely.
+        _fast_dump({"matches": [entry]}, filepath)
+        _invalidate_cache(filepath)
+        return
+
+    if not is_new and filepath.exists():
+        # Try rewriting only the edited entry's byte span; cost becomes
+        # O(entry) instead of re-dumping the whole file.
+        try:
+            current = _cached_load(filepath)
+        except OSError:
+            current = None
+        matches = current.get("matches") if isinstance(current, dict) else None
+        if matches is not None and index < len(matches):
+            patched_entry = dict(entry)
+            orig = matches[index]
+            if isinstance(orig, dict):
+                for k in orig:
+                    if k not in ["trigger", "replace", "markdown", "word", "propagate_case"]:
+                        patched_entry[k] = orig[k]
+            if _patch_match_span(filepath, index, patched_entry):
+                return
+
+    data = {}
+    if filepath.exists():
+        with open(filepath, "rb") as f:
+            loaded = yaml.load(f)
+            data = loaded if isinstance(loaded, dict) else {}
+
+    if "matches" not in data:
+        data["matches"] = []
+
     if is_new:
         data["matches"].append(entry)
     else:
@@ -169,148 +616,204 @@ def save_snippet(filepath, index, trigger, replace, word, pcase, is_markdown, is
 
     with open(filepath, "w", encoding="utf-8") as f:
         yaml.dump(data, f)
+    _invalidate_cache(filepath)
 
 def delete_snippet(filepath, index):
     filepath = Path(filepath)
     if not filepath.exists(): return
-    with open(filepath, "r", encoding="utf-8") as f:
+    # Span-splice the doomed entry when possible (not for the last entry:
+    # emptying the file goes through the full path below).
+    if _patch_match_span(filepath, index, None, keep_nonempty=True):
+        return
+    with open(filepath, "rb") as f:
         data = yaml.load(f)
     if data and "matches" in data and index < len(data["matches"]):
         del data["matches"][index]
         with open(filepath, "w", encoding="utf-8") as f:
             yaml.dump(data, f) if data["matches"] else f.write('')
+        _invalidate_cache(filepath)
 
-def move_snippet(source_file, source_index, target_file):
-    """Move a snippet from one file to another"""
-    source_path = Path(source_file)
+def move_snippets_batch(moves, target_file):
+    """Move snippets, grouped as {source_file: [indices]}, into target_file.
+
+    Each file is parsed and written at most once no matter how many
+    snippets move; ruamel round-trips both sides so formatting survives.
+    Returns the number of snippets moved.
+    """
     target_path = Path(target_file)
-    
-    if not source_path.exists():
-        raise FileNotFoundError(f"Source file not found: {source_file}")
-    
-    # Load source file
-    with open(source_path, "r", encoding="utf-8") as f:
-        source_data = yaml.load(f)
-    
-    if not source_data or "matches" not in source_data:
-        raise ValueError("Source file has no matches")
-    
-    if source_index >= len(source_data["matches"]):
-        raise IndexError(f"Index {source_index} out of range")
-    
-    # Get the snippet to move
-    snippet = source_data["matches"][source_index]
-    
-    # Load or create target file
+    # Nothing to do when every selected snippet already lives in the target;
+    # skip the parse/rewrite round-trip entirely.
+    if all(source == os.fspath(target_path) for source in moves):
+        return 0
     target_path.parent.mkdir(parents=True, exist_ok=True)
     target_data = {}
     if target_path.exists():
-        with open(target_path, "r", encoding="utf-8") as f:
+        with open(target_path, "rb") as f:
             loaded = yaml.load(f)
             target_data = loaded if isinstance(loaded, dict) else {}
-    
     if "matches" not in target_data:
         target_data["matches"] = []
-    
-    # Add to target
-    target_data["matches"].append(snippet)
-    
-    # Remove from source
-    del source_data["matches"][source_index]
-    
-    # Save both files
-    with open(target_path, "w", encoding="utf-8") as f:
-        yaml.dump(target_data, f)
-    
-    with open(source_path, "w", encoding="utf-8") as f:
-        if source_data["matches"]:
-            yaml.dump(source_data, f)
-        else:
-            f.write('')
 
-def copy_snippets_to_file(snippet_ids, target_file):
-    """Copy multiple snippets to a target file (for export)"""
-    target_path = Path(target_file)
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    
+    # Source paths stay strings end to end (they come out of ids built
+    # from scandir paths); only the target needed Path normalization.
+    target_str = os.fspath(target_path)
+    moved = 0
+    for source_file, indices in moves.items():
+        if source_file == target_str:  # don't move a snippet onto itself
+            continue
+        if not os.path.exists(source_file):
+            raise FileNotFoundError(f"Source file not found: {source_file}")
+
+        with open(source_file, "rb") as f:
+            source_data = yaml.load(f)
+        if not source_data or "matches" not in source_data:
+            raise ValueError("Source file has no matches")
+
+        matches = source_data["matches"]
+        # One O(N) rebuild instead of K pops (each of which shifts the
+        # tail of the list); slice assignment keeps ruamel's container.
+        to_move = sorted(set(indices))
+        # Negative indices would read from the tail but survive the
+        # enumerate-based rebuild below, duplicating the snippet.
+        if to_move and (to_move[0] < 0 or to_move[-1] >= len(matches)):
+            bad = to_move[0] if to_move[0] < 0 else to_move[-1]
+            raise IndexError(f"Index {bad} out of range")
+        target_data["matches"].extend(matches[i] for i in to_move)
+        remove = set(to_move)
+        matches[:] = [m for i, m in enumerate(matches) if i not in remove]
+        moved += len(to_move)
+
+        with open(source_file, "w", encoding="utf-8") as f:
+            if matches:
+                yaml.dump(source_data, f)
+            else:
+                f.write('')
+        _invalidate_cache(source_file)
+
+    if moved:
+        with open(target_path, "w", encoding="utf-8") as f:
+            yaml.dump(target_data, f)
+        _invalidate_cache(target_path)
+    return moved
+
+# Finished exports parked in memory until downloaded, instead of a file
+# under the system temp dir. Bounded so abandoned exports can't pile up.
+_EXPORTS = {}  # filename -> yaml bytes
+_EXPORTS_MAX = 16
+
+def build_export(snippet_ids):
+    """Collect snippets by id into one export document, all in memory.
+
+    Returns (count, yaml bytes); nothing touches the disk.
+    """
     target_data = {"matches": []}
-    if target_path.exists():
-        with open(target_path, "r", encoding="utf-8") as f:
-            loaded = yaml.load(f)
-            if loaded and "matches" in loaded:
-                target_data = loaded
-    
-    snippets, _ = load_snippets()
-    snippets_by_id = {s["id"]: s for s in snippets}
-    
+
+    # The ids already encode '<file>::<index>', so group them by source
+    # file directly — no load_snippets() tree walk needed. Each file is
+    # parsed once and entries are taken from the file itself, preserving
+    # fields beyond the ones the UI knows about.
+    by_file = defaultdict(list)
     for sid in snippet_ids:
-        if sid in snippets_by_id:
-            s = snippets_by_id[sid]
-            # Load original entry from file to preserve all fields
-            source_path = Path(s["file"])
-            with open(source_path, "r", encoding="utf-8") as f:
-                source_data = yaml.load(f)
-            if source_data and "matches" in source_data and s["index"] < len(source_data["matches"]):
-                entry = source_data["matches"][s["index"]]
-                target_data["matches"].append(entry)
-    
-    with open(target_path, "w", encoding="utf-8") as f:
-        yaml.dump(target_data, f)
-    
-    return len(snippet_ids)
+        filepath, _, index = sid.rpartition("::")
+        if filepath:
+            try:
+                by_file[filepath].append(int(index))
+            except ValueError:
+                continue
+
+    copied = 0
+    for fpath, indices in by_file.items():
+        source_data = _fast_load(fpath) if os.path.exists(fpath) else None
+        matches = source_data.get("matches") if source_data else None
+        if not matches:
+            continue
+        for i in sorted(indices):
+            if 0 <= i < len(matches):
+                target_data["matches"].append(matches[i])
+                copied += 1
+
+    text = pyyaml.dump(target_data, Dumper=_FAST_DUMPER, sort_keys=False,
+                       allow_unicode=True, default_flow_style=False, indent=2)
+    return copied, text.encode("utf-8")
+
+def import_yaml_file(stream, filename, merge_into=None):
+    """Import an uploaded YAML collection into the Espanso match directory.
+
+    Reads the upload once into memory and parses it from there — no temp
+    file round trip through the disk.
+    """
+    raw = stream.read()
+
+    # Same cheap header check the loader uses on disk files: a small
+    # upload with no 'matches:' key is rejected without a parse. Strip a
+    # UTF-8 BOM first so files from BOM-saving editors aren't rejected.
+    body = raw.removeprefix(BOM_UTF8)
+    if len(body) <= _SNIFF_BYTES and b"\nmatches:" not in b"\n" + body:
+        raise ValueError("Invalid Espanso file: no 'matches' key found")
 
-def import_yaml_file(source_path, merge_into=None):
-    """Import a YAML file into Espanso match directory"""
-    source_path = Path(source_path)
-    
-    if not source_path.exists():
-        raise FileNotFoundError(f"File not found: {source_path}")
-    
     # Validate it's a valid Espanso file
-    with open(source_path, "r", encoding="utf-8") as f:
-        data = yaml.load(f)
-    
+    try:
+        data = pyyaml.load(raw, Loader=_FAST_LOADER)
+    except Exception:
+        data = yaml.load(raw.decode("utf-8"))
+
     if not data or "matches" not in data:
         raise ValueError("Invalid Espanso file: no 'matches' key found")
-    
+
     if merge_into:
         # Merge into existing file
         target_path = Path(merge_into)
         if target_path.exists():
-            with open(target_path, "r", encoding="utf-8") as f:
-                target_data = yaml.load(f)
+            target_data = _fast_load(target_path)
             if target_data and "matches" in target_data:
                 target_data["matches"].extend(data["matches"])
             else:
                 target_data = data
         else:
             target_data = data
-        
-        with open(target_path, "w", encoding="utf-8") as f:
-            yaml.dump(target_data, f)
-        
+
+        _fast_dump(target_data, target_path)
+        _invalidate_cache(target_path)
+
         return len(data["matches"]), target_path
     else:
         # Copy as new file
-        target_name = source_path.stem
+        target_name = Path(_safe_yml_name(filename or "imported.yml")).stem
         target_path = MATCH_DIR / f"{target_name}.yml"
-        
+
         # Avoid overwriting
         counter = 1
         while target_path.exists():
             target_path = MATCH_DIR / f"{target_name}_{counter}.yml"
             counter += 1
-        
-        shutil.copy(source_path, target_path)
+
+        # Write the original bytes so the user's formatting survives.
+        target_path.write_bytes(raw)
         return len(data["matches"]), target_path
 
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+_NEW_PREFIX = "_new_:"  # move-target sentinel sent by the UI for a new file
+
+@lru_cache(maxsize=256)
+def _safe_yml_name(filename):
+    """Sanitize a user-supplied collection name and ensure the .yml suffix.
+
+    Cached because the export/download pair sanitizes the same name on
+    both requests; invalid names raise and are never cached.
+    """
+    base, ext = os.path.splitext(filename)
+    if ext.lower() != ".yml":
+        base = filename
+    safe = _SAFE_NAME_RE.sub("_", base).strip("._")
+    if not safe:
+        raise ValueError(f"Invalid collection name: {filename!r}")
+    # Always the lowercase suffix: '.YML' files are invisible to the
+    # .yml-only directory walk (and to espanso on case-sensitive systems).
+    return safe + ".yml"
+
 def create_new_file(filename):
     """Create a new empty YAML file"""
-    if not filename.endswith('.yml'):
-        filename += '.yml'
-    
-    # Sanitize filename
-    filename = secure_filename(filename)
+    filename = _safe_yml_name(filename)
     filepath = MATCH_DIR / filename
     
     if filepath.exists():
@@ -319,39 +822,50 @@ def create_new_file(filename):
     filepath.parent.mkdir(parents=True, exist_ok=True)
     
     # Create empty matches file
-    data = {"matches": []}
-    with open(filepath, "w", encoding="utf-8") as f:
-        yaml.dump(data, f)
-    
+    _fast_dump({"matches": []}, filepath)
+
     return filepath
 
+_LAST_FOLDER_OPEN = 0.0
+
 def open_folder(folder_path):
     """Open the folder in the system file manager"""
+    import subprocess
+    import time
+    global _LAST_FOLDER_OPEN
     folder_path = Path(folder_path)
     if not folder_path.exists():
         return False
+    # Debounce rapid double-clicks so they don't each spawn a file manager.
+    now = time.monotonic()
+    if now - _LAST_FOLDER_OPEN < 0.5:
+        return True
+    _LAST_FOLDER_OPEN = now
     try:
-        if sys.platform == "win32":
-            subprocess.run(['explorer', str(folder_path)], check=False)
+        if _IS_WIN:
+            cmd = ['explorer', str(folder_path)]
         elif sys.platform == "darwin":
-            subprocess.run(['open', str(folder_path)], check=False)
+            cmd = ['open', str(folder_path)]
+        else:
+            cmd = ['xdg-open', str(folder_path)]
+        # Fire and forget: don't hold the request thread while the file
+        # manager starts up, and detach so it outlives us.
+        kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL,
+                  "stderr": subprocess.DEVNULL}
+        if _IS_WIN:
+            kwargs["creationflags"] = (subprocess.DETACHED_PROCESS |
+                                       subprocess.CREATE_NEW_PROCESS_GROUP)
         else:
-            subprocess.run(['xdg-open', str(folder_path)], check=False)
+            kwargs["start_new_session"] = True
+        subprocess.Popen(cmd, **kwargs)
         return True
     except Exception as e:
         print(f"Error opening folder: {e}")
         return False
 
-TEMPLATE = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1">
-<title>SnippetMaster</title>
-<link rel="preconnect" href="https://fonts.googleapis.com">
-<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-<link href="https://fonts.googleapis.com/css2?family=IBM+Plex+Sans:wght@400;500;600&family=JetBrains+Mono:wght@500&display=swap" rel="stylesheet">
-<style>
-:root {
+# The full stylesheet lives outside the template so it can be served
+# once as an immutable asset instead of inlined into every response.
+_APP_CSS = ''':root {
     --bg-primary: #0d0d14;
     --bg-secondary: #16161f;
     --bg-card: #1e1e2a;
@@ -539,7 +1053,8 @@ header {
 .selection-mode .snippet-card { cursor: default; }
 .selection-mode .snippet-card:hover { transform: none; }
 
-#snippet-list { display: flex; flex-direction: column; gap: 10px; }
+#snippet-list { position: relative; }
+#snippet-list .snippet-card { position: absolute; top: 0; left: 0; right: 0; }
 
 .snippet-card {
     background: var(--bg-card);
@@ -776,9 +1291,34 @@ header {
     .snippet-actions { opacity: 1; }
     .snippet-preview { max-width: 100%; }
 }
-</style>
+'''
+
+_BASE_TPL = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1">
+<title>SnippetMaster</title>
+<link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+<link href="https://fonts.googleapis.com/css2?family=IBM+Plex+Sans:wght@400;500;600&family=JetBrains+Mono:wght@500&display=swap" rel="stylesheet">
+<link rel="stylesheet" href="/assets/__APP_CSS__">
 </head>
 <body>
+<!-- Icons that repeat across the page are defined once and referenced
+     with <use>, so each instance costs one node instead of a path copy. -->
+<svg style="display:none" aria-hidden="true"><defs>
+    <symbol id="ico-edit" viewBox="0 0 24 24">
+        <path d="M11 4H4a2 2 0 0 0-2 2v14a2 2 0 0 0 2 2h14a2 2 0 0 0 2-2v-7"></path>
+        <path d="M18.5 2.5a2.121 2.121 0 0 1 3 3L12 15l-4 1 1-4 9.5-9.5z"></path>
+    </symbol>
+    <symbol id="ico-delete" viewBox="0 0 24 24">
+        <polyline points="3 6 5 6 21 6"></polyline>
+        <path d="M19 6v14a2 2 0 0 1-2 2H7a2 2 0 0 1-2-2V6m3 0V4a2 2 0 0 1 2-2h4a2 2 0 0 1 2 2v2"></path>
+    </symbol>
+    <symbol id="ico-folder" viewBox="0 0 24 24">
+        <path d="M22 19a2 2 0 0 1-2 2H4a2 2 0 0 1-2-2V5a2 2 0 0 1 2-2h5l2 3h9a2 2 0 0 1 2 2z"></path>
+    </symbol>
+</defs></svg>
 <div class="container">
 <header>
 <div class="header-left">
@@ -840,9 +1380,7 @@ header {
             </button>
             <div class="dropdown-divider"></div>
             <button class="dropdown-item" onclick="openMatchDir()">
-                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                    <path d="M22 19a2 2 0 0 1-2 2H4a2 2 0 0 1-2-2V5a2 2 0 0 1 2-2h5l2 3h9a2 2 0 0 1 2 2z"></path>
-                </svg>
+                <svg width="16" height="16" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><use href="#ico-folder"/></svg>
                 Open Espanso Folder
             </button>
         </div>
@@ -867,1750 +1405,141 @@ header {
 </div>
 {% endif %}
 
-{% if view == 'list' %}
-    <!-- Selection Bar -->
-    <div class="selection-bar" id="selection-bar">
-        <span class="selection-count"><span id="selected-count">0</span> selected</span>
-        <button class="btn btn-sm btn-purple" onclick="openMoveModal()">
-            <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                <path d="M5 12h14M12 5l7 7-7 7"/>
-            </svg>
-            Move to...
-        </button>
-        <button class="btn btn-sm btn-success" onclick="openExportModal()">
-            <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                <path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>
-                <polyline points="17 8 12 3 7 8"></polyline>
-                <line x1="12" y1="3" x2="12" y2="15"></line>
-            </svg>
-            Export...
-        </button>
-        <button class="btn btn-sm btn-secondary" onclick="toggleSelectionMode()">Cancel</button>
-    </div>
+{% block content %}{% endblock %}
+</main>
+</div>
+</body>
+</html>'''
 
-    {% if snippets %}
-    <div class="controls-bar">
-        <select id="filter-file" class="control-select">
-            <option value="all">Collection: All files</option>
-            {% for file in unique_files %}
-            <option value="{{ file.path }}">Collection: {{ file.label }}</option>
-            {% endfor %}
-        </select>
-        <select id="sort-order" class="control-select">
-            <option value="asc">Sort: A → Z</option>
-            <option value="desc">Sort: Z → A</option>
-        </select>
-        <button id="btn-open-folder" class="btn btn-folder" title="Open folder in file manager">
-            <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                <path d="M22 19a2 2 0 0 1-2 2H4a2 2 0 0 1-2-2V5a2 2 0 0 1 2-2h5l2 3h9a2 2 0 0 1 2 2z"></path>
-            </svg>
-            Open Folder
-        </button>
-        <span id="filtered-count" class="filtered-count"></span>
-    </div>
+# List-view behavior, shipped as a cacheable deferred script instead of
+# being re-inlined (and re-parsed) on every page load.
+_LIST_JS = '''(function() {
+    const filterSelect = document.getElementById('filter-file');
+    const sortSelect = document.getElementById('sort-order');
+    const openFolderBtn = document.getElementById('btn-open-folder');
+    const filteredCountSpan = document.getElementById('filtered-count');
+    const snippetList = document.getElementById('snippet-list');
+    const searchInput = document.getElementById('search-input');
+    const menuBtn = document.getElementById('menu-btn');
+    const menuDropdown = document.getElementById('menu-dropdown');
+    const selectionBar = document.getElementById('selection-bar');
+    const selectedCountEl = document.getElementById('selected-count');
+    const toggleSelectionBtn = document.getElementById('toggle-selection-btn');
+    const moveFileItems = document.querySelectorAll('#move-file-list .file-item');
+    const moveNewFile = document.getElementById('move-new-file');
+    const moveNewFilename = document.getElementById('move-new-filename');
+
+    // Virtualized list: the embedded JSON payload is the source of truth and
+    // only a small pool of card nodes ever exists. The pool is re-bound to
+    // whichever rows intersect the viewport, so DOM size and per-keystroke
+    // cost stay constant no matter how large the collection grows.
+    const dataEl = document.getElementById('snippet-data');
+    const snippetData = dataEl ? JSON.parse(dataEl.textContent) : [];
+    const cardTmpl = document.getElementById('card-tmpl');
+    for (let i = 0, n = snippetData.length; i < n; i++) {
+        const d = snippetData[i];
+        d.qid = encodeURIComponent(d.id).replace(/%2F/gi, '/');
+        d.lt = d.t.toLowerCase();
+    }
 
-    <div id="snippet-list">
-        {% for s in snippets %}
-        <div class="snippet-card" data-file="{{ s.file }}" data-trigger="{{ s.trigger|lower }}" data-id="{{ s.id|urlencode }}">
-            <div class="snippet-content">
-                <input type="checkbox" class="snippet-checkbox" data-id="{{ s.id|urlencode }}" onclick="event.stopPropagation(); updateSelectionCount();">
-                <div class="snippet-info">
-                    <div class="snippet-header">
-                        <span class="snippet-trigger">{{ s.trigger }}</span>
-                        <span class="badge badge-file">{{ s.file_label }}</span>
-                        {% if s.word %}<span class="badge badge-word">word</span>{% endif %}
-                        {% if s.propagate_case %}<span class="badge badge-case">case</span>{% endif %}
-                        {% if s.is_markdown %}<span class="badge badge-md">md</span>{% endif %}
-                    </div>
-                    <div class="snippet-preview">Expansion: {{ s.replace.split('\n')[0][:80] }}</div>
-                </div>
-            </div>
-            <div class="snippet-actions">
-                <a href="/edit/{{ s.id|urlencode }}" class="btn btn-icon btn-edit" onclick="event.stopPropagation();" title="Edit">
-                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                        <path d="M11 4H4a2 2 0 0 0-2 2v14a2 2 0 0 0 2 2h14a2 2 0 0 0 2-2v-7"></path>
-                        <path d="M18.5 2.5a2.121 2.121 0 0 1 3 3L12 15l-4 1 1-4 9.5-9.5z"></path>
-                    </svg>
-                </a>
-                <a href="/delete/{{ s.id|urlencode }}" class="btn btn-icon btn-delete" onclick="event.stopPropagation();" title="Delete">
-                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                        <polyline points="3 6 5 6 21 6"></polyline>
-                        <path d="M19 6v14a2 2 0 0 1-2 2H7a2 2 0 0 1-2-2V6m3 0V4a2 2 0 0 1 2-2h4a2 2 0 0 1 2 2v2"></path>
-                    </svg>
-                </a>
-            </div>
-        </div>
-        {% endfor %}
-    </div>
-    {% else %}
-        <div class="empty-state">
-            <h2>No snippets yet</h2>
-            <p>Click <strong>+ Add New</strong> to create your first snippet, or import an existing collection.</p>
-        </div>
-    {% endif %}
+    const selectedIds = new Set();   // survives pool recycling
+
+    // Both sort orders are computed once; a keystroke only filters one of
+    // them, so no localeCompare calls remain on the hot path.
+    const ascOrder = snippetData.map((_, i) => i)
+        .sort((a, b) => snippetData[a].lt < snippetData[b].lt ? -1 : 1);
+    const descOrder = ascOrder.slice().reverse();
+    let order = ascOrder;            // filtered + sorted row -> data index
+    let rowHeight = 86;              // re-measured from the first bound card
+    const OVERSCAN = 8;
+    const pool = [];
+
+    function bindCard(node, d, row) {
+        node.dataset.file = d.f;
+        node.dataset.trigger = d.lt;
+        node.dataset.id = d.qid;
+        node.querySelector('.snippet-trigger').textContent = d.t;
+        node.querySelector('.badge-file').textContent = d.lbl;
+        node.querySelector('.badge-word').style.display = d.w ? '' : 'none';
+        node.querySelector('.badge-case').style.display = d.c ? '' : 'none';
+        node.querySelector('.badge-md').style.display = d.md ? '' : 'none';
+        node.querySelector('.snippet-preview').textContent = 'Expansion: ' + d.p;
+        const cb = node.querySelector('.snippet-checkbox');
+        cb.dataset.id = d.qid;
+        cb.checked = selectedIds.has(d.qid);
+        node.classList.toggle('selected', cb.checked);
+        node.querySelector('.btn-edit').href = '/edit/' + d.qid;
+        node.querySelector('.btn-delete').href = '/delete/' + d.qid;
+        node.style.transform = 'translateY(' + (row * rowHeight) + 'px)';
+        node.style.display = '';
+    }
 
-<!-- New File Modal -->
-<div class="modal-overlay" id="new-file-modal">
-    <div class="modal">
-        <h2 class="modal-title">Create New Collection</h2>
-        <form id="new-file-form" action="/create-file" method="POST">
-            <div class="form-group">
-                <label class="form-label" for="new-filename">Collection Name</label>
-                <input type="text" id="new-filename" name="filename" class="form-input" placeholder="my-snippets" required>
-                <p style="font-size: 0.8rem; color: var(--text-muted); margin-top: 8px;">.yml extension will be added automatically</p>
-            </div>
-            <div class="modal-actions">
-                <button type="button" class="btn btn-secondary" onclick="closeModal('new-file-modal')">Cancel</button>
-                <button type="submit" class="btn btn-primary">Create</button>
-            </div>
-        </form>
-    </div>
-</div>
+    function renderWindow() {
+        if (!snippetList || !cardTmpl) return;
+        snippetList.style.height = (order.length * rowHeight) + 'px';
+        const top = snippetList.getBoundingClientRect().top + window.scrollY;
+        const first = Math.max(0, Math.floor((window.scrollY - top) / rowHeight) - OVERSCAN);
+        const need = Math.min(Math.ceil(window.innerHeight / rowHeight) + 2 * OVERSCAN,
+                              order.length);
+        if (pool.length < need) {
+            const frag = document.createDocumentFragment();
+            while (pool.length < need) {
+                const node = cardTmpl.content.firstElementChild.cloneNode(true);
+                frag.appendChild(node);
+                pool.push(node);
+            }
+            snippetList.appendChild(frag);
+        }
+        const start = Math.min(first, Math.max(0, order.length - need));
+        // Indexed loop: this runs on every scroll frame, so skip the
+        // per-element callback that forEach would cost.
+        for (let k = 0, rows = order.length, np = pool.length; k < np; k++) {
+            const row = start + k;
+            if (row < rows) {
+                bindCard(pool[k], snippetData[order[row]], row);
+            } else {
+                pool[k].style.display = 'none';
+            }
+        }
+    }
 
-<!-- Import Modal -->
-<div class="modal-overlay" id="import-modal">
-    <div class="modal">
-        <h2 class="modal-title">Import Collection</h2>
-        <form id="import-form" action="/import" method="POST" enctype="multipart/form-data">
-            <div class="form-group">
-                <label class="form-label">Select YAML file</label>
-                <div class="file-input-wrapper">
-                    <input type="file" id="import-file" name="file" accept=".yml,.yaml" required onchange="updateFileLabel(this)">
-                    <div class="file-input-label">
-                        <svg width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                            <path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>
-                            <polyline points="7 10 12 15 17 10"></polyline>
-                            <line x1="12" y1="15" x2="12" y2="3"></line>
-                        </svg>
-                        <span>Click to select or drag and drop</span>
-                    </div>
-                </div>
-                <div id="selected-file-name" class="selected-file" style="display: none;"></div>
-            </div>
-            <div class="form-group">
-                <label class="form-label">Import as</label>
-                <div class="option-item" style="padding: 0;">
-                    <input type="radio" id="import-new" name="import_mode" value="new" checked>
-                    <label for="import-new">New collection (keep original filename)</label>
-                </div>
-                <div class="option-item" style="border: none;">
-                    <input type="radio" id="import-merge" name="import_mode" value="merge">
-                    <label for="import-merge">Merge into existing collection</label>
-                </div>
-                <select id="merge-target" name="merge_target" class="control-select" style="width: 100%; margin-top: 8px; display: none;">
-                    {% for file in unique_files %}
-                    <option value="{{ file.path }}">{{ file.label }}</option>
-                    {% endfor %}
-                </select>
-            </div>
-            <div class="modal-actions">
-                <button type="button" class="btn btn-secondary" onclick="closeModal('import-modal')">Cancel</button>
-                <button type="submit" class="btn btn-success">Import</button>
-            </div>
-        </form>
-    </div>
-</div>
-
-<!-- Move Modal -->
-<div class="modal-overlay" id="move-modal">
-    <div class="modal">
-        <h2 class="modal-title">Move Snippets</h2>
-        <p style="color: var(--text-secondary); margin-bottom: 16px;">Select destination collection:</p>
-        <div class="file-list" id="move-file-list">
-            {% for file in unique_files %}
-            <div class="file-item" data-path="{{ file.path }}" onclick="selectMoveTarget(this)">
-                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                    <path d="M14 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V8z"></path>
-                    <polyline points="14 2 14 8 20 8"></polyline>
-                </svg>
-                <div>
-                    <div class="file-item-label">{{ file.label }}</div>
-                    <div class="file-item-path">{{ file.relative }}</div>
-                </div>
-            </div>
-            {% endfor %}
-        </div>
-        <div style="margin-top: 12px;">
-            <button class="btn btn-sm btn-secondary" onclick="showNewFileInMove()">
-                <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                    <path d="M12 5v14M5 12h14"/>
-                </svg>
-                Create new collection
-            </button>
-        </div>
-        <div id="move-new-file" style="display: none; margin-top: 12px;">
-            <input type="text" id="move-new-filename" class="form-input" placeholder="new-collection-name">
-        </div>
-        <div class="modal-actions">
-            <button type="button" class="btn btn-secondary" onclick="closeModal('move-modal')">Cancel</button>
-            <button type="button" class="btn btn-purple" id="move-confirm-btn" onclick="confirmMove()">Move</button>
-        </div>
-    </div>
-</div>
-
-<!-- Export Modal -->
-<div class="modal-overlay" id="export-modal">
-    <div class="modal">
-        <h2 class="modal-title">Export Snippets</h2>
-        <p style="color: var(--text-secondary); margin-bottom: 16px;">Export selected snippets to a new file for sharing.</p>
-        <div class="form-group">
-            <label class="form-label" for="export-filename">Export filename</label>
-            <input type="text" id="export-filename" class="form-input" placeholder="shared-snippets" value="shared-snippets">
-            <p style="font-size: 0.8rem; color: var(--text-muted); margin-top: 8px;">.yml extension will be added automatically</p>
-        </div>
-        <div class="modal-actions">
-            <button type="button" class="btn btn-secondary" onclick="closeModal('export-modal')">Cancel</button>
-            <button type="button" class="btn btn-success" onclick="confirmExport()">Export & Download</button>
-        </div>
-    </div>
-</div>
-
-<script>
-(function() {
-    const filterSelect = document.getElementById('filter-file');
-    const sortSelect = document.getElementById('sort-order');
-    const openFolderBtn = document.getElementById('btn-open-folder');
-    const filteredCountSpan = document.getElementById('filtered-count');
-    const snippetList = document.getElementById('snippet-list');
-    const searchInput = document.getElementById('search-input');
-    const cards = snippetList ? Array.from(snippetList.querySelectorAll('.snippet-card')) : [];
-    const menuBtn = document.getElementById('menu-btn');
-    const menuDropdown = document.getElementById('menu-dropdown');
-
-    let searchQuery = '';
-    let selectionMode = false;
-
-    // Dropdown menu
-    if (menuBtn) {
-        menuBtn.addEventListener('click', (e) => {
-            e.stopPropagation();
-            menuDropdown.classList.toggle('active');
-        });
-        document.addEventListener('click', () => menuDropdown.classList.remove('active'));
-    }
-
-    // Click handler for cards
-    cards.forEach(card => {
-        card.addEventListener('click', function(e) {
-            if (selectionMode) {
-                const checkbox = this.querySelector('.snippet-checkbox');
-                checkbox.checked = !checkbox.checked;
-                this.classList.toggle('selected', checkbox.checked);
-                updateSelectionCount();
-            } else if (!e.target.closest('.snippet-actions')) {
-                location.href = '/edit/' + this.dataset.id;
-            }
-        });
-    });
-
-    function applyFilterAndSort() {
-        if (!filterSelect || !sortSelect) return;
-        
-        const filterValue = filterSelect.value;
-        const sortValue = sortSelect.value;
-
-        if (openFolderBtn) {
-            if (filterValue === 'all') {
-                openFolderBtn.style.display = 'none';
-            } else {
-                openFolderBtn.style.display = 'inline-flex';
-                openFolderBtn.dataset.filepath = filterValue;
-            }
-        }
-
-        let visibleCards = cards.filter(card => {
-            const matchesFile = filterValue === 'all' || card.dataset.file === filterValue;
-            const matchesSearch = !searchQuery ||
-                card.dataset.trigger.includes(searchQuery.toLowerCase()) ||
-                card.querySelector('.snippet-preview').textContent.toLowerCase().includes(searchQuery.toLowerCase());
-            return matchesFile && matchesSearch;
-        });
-
-        visibleCards.sort((a, b) => {
-            const triggerA = a.dataset.trigger;
-            const triggerB = b.dataset.trigger;
-            return sortValue === 'asc' ? triggerA.localeCompare(triggerB) : triggerB.localeCompare(triggerA);
-        });
-
-        cards.forEach(card => card.style.display = 'none');
-        visibleCards.forEach(card => {
-            card.style.display = 'flex';
-            snippetList.appendChild(card);
-        });
-
-        const total = cards.length;
-        const visible = visibleCards.length;
-        if (filteredCountSpan) {
-            filteredCountSpan.textContent = (filterValue === 'all' && !searchQuery) ? '' : `Showing ${visible} of ${total}`;
-        }
-    }
-
-    if (filterSelect) filterSelect.addEventListener('change', applyFilterAndSort);
-    if (sortSelect) sortSelect.addEventListener('change', applyFilterAndSort);
-    if (searchInput) searchInput.addEventListener('input', function() { searchQuery = this.value; applyFilterAndSort(); });
-
-    if (openFolderBtn) {
-        openFolderBtn.addEventListener('click', function() {
-            const filepath = this.dataset.filepath;
-            if (filepath) {
-                fetch('/open-folder', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ filepath: filepath })
-                }).then(r => r.json()).then(data => {
-                    if (!data.success) alert('Could not open folder: ' + (data.error || 'Unknown error'));
-                }).catch(() => alert('Error opening folder'));
-            }
-        });
-    }
-
-    applyFilterAndSort();
-
-    // Selection mode
-    window.toggleSelectionMode = function() {
-        selectionMode = !selectionMode;
-        document.body.classList.toggle('selection-mode', selectionMode);
-        document.getElementById('selection-bar').classList.toggle('active', selectionMode);
-        document.getElementById('toggle-selection-btn').innerHTML = selectionMode ? 
-            '<svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M18 6L6 18M6 6l12 12"/></svg> Cancel Selection' :
-            '<svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="9 11 12 14 22 4"></polyline><path d="M21 12v7a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2V5a2 2 0 0 1 2-2h11"></path></svg> Select Snippets';
-        
-        if (!selectionMode) {
-            document.querySelectorAll('.snippet-checkbox').forEach(cb => cb.checked = false);
-            document.querySelectorAll('.snippet-card').forEach(card => card.classList.remove('selected'));
-            updateSelectionCount();
-        }
-        menuDropdown.classList.remove('active');
-    };
-
-    window.updateSelectionCount = function() {
-        const count = document.querySelectorAll('.snippet-checkbox:checked').length;
-        document.getElementById('selected-count').textContent = count;
-    };
-
-    // Modals
-    window.openModal = function(id) {
-        document.getElementById(id).classList.add('active');
-        menuDropdown.classList.remove('active');
-    };
-
-    window.closeModal = function(id) {
-        document.getElementById(id).classList.remove('active');
-    };
-
-    // Close modal on overlay click
-    document.querySelectorAll('.modal-overlay').forEach(overlay => {
-        overlay.addEventListener('click', function(e) {
-            if (e.target === this) this.classList.remove('active');
-        });
-    });
-
-    // Import modal - toggle merge target
-    document.querySelectorAll('input[name="import_mode"]').forEach(radio => {
-        radio.addEventListener('change', function() {
-            document.getElementById('merge-target').style.display = this.value === 'merge' ? 'block' : 'none';
-        });
-    });
-
-    window.updateFileLabel = function(input) {
-        const fileName = input.files[0]?.name;
-        const display = document.getElementById('selected-file-name');
-        if (fileName) {
-            display.textContent = 'Selected: ' + fileName;
-            display.style.display = 'block';
-        } else {
-            display.style.display = 'none';
-        }
-    };
-
-    // Move modal
-    let selectedMoveTarget = null;
-    let createNewInMove = false;
-
-    window.openMoveModal = function() {
-        selectedMoveTarget = null;
-        createNewInMove = false;
-        document.querySelectorAll('#move-file-list .file-item').forEach(item => item.classList.remove('selected'));
-        document.getElementById('move-new-file').style.display = 'none';
-        document.getElementById('move-new-filename').value = '';
-        openModal('move-modal');
-    };
-
-    window.selectMoveTarget = function(el) {
-        document.querySelectorAll('#move-file-list .file-item').forEach(item => item.classList.remove('selected'));
-        el.classList.add('selected');
-        selectedMoveTarget = el.dataset.path;
-        createNewInMove = false;
-        document.getElementById('move-new-file').style.display = 'none';
-    };
-
-    window.showNewFileInMove = function() {
-        document.querySelectorAll('#move-file-list .file-item').forEach(item => item.classList.remove('selected'));
-        selectedMoveTarget = null;
-        createNewInMove = true;
-        document.getElementById('move-new-file').style.display = 'block';
-        document.getElementById('move-new-filename').focus();
-    };
-
-    window.confirmMove = function() {
-        const selected = Array.from(document.querySelectorAll('.snippet-checkbox:checked')).map(cb => cb.dataset.id);
-        if (selected.length === 0) { alert('No snippets selected'); return; }
-
-        let targetFile = selectedMoveTarget;
-        if (createNewInMove) {
-            const newName = document.getElementById('move-new-filename').value.trim();
-            if (!newName) { alert('Please enter a collection name'); return; }
-            targetFile = '_new_:' + newName;
-        }
-
-        if (!targetFile) { alert('Please select a destination'); return; }
-
-        fetch('/move-snippets', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ snippets: selected, target: targetFile })
-        }).then(r => r.json()).then(data => {
-            if (data.success) {
-                location.href = '/?msg=' + encodeURIComponent(data.message) + '&mt=success';
-            } else {
-                alert('Error: ' + data.error);
-            }
-        }).catch(err => alert('Error moving snippets'));
-    };
-
-    // Export modal
-    window.openExportModal = function() {
-        const count = document.querySelectorAll('.snippet-checkbox:checked').length;
-        if (count === 0) { alert('No snippets selected'); return; }
-        document.getElementById('export-filename').value = 'shared-snippets';
-        openModal('export-modal');
-    };
-
-    window.confirmExport = function() {
-        const selected = Array.from(document.querySelectorAll('.snippet-checkbox:checked')).map(cb => cb.dataset.id);
-        const filename = document.getElementById('export-filename').value.trim() || 'shared-snippets';
-
-        fetch('/export-snippets', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ snippets: selected, filename: filename })
-        }).then(r => r.json()).then(data => {
-            if (data.success) {
-                // Trigger download
-                window.location.href = '/download-export/' + encodeURIComponent(data.filename);
-                closeModal('export-modal');
-                toggleSelectionMode();
-            } else {
-                alert('Error: ' + data.error);
-            }
-        }).catch(err => alert('Error exporting snippets'));
-    };
-
-    window.openMatchDir = function() {
-        fetch('/open-match-dir', { method: 'POST' })
-            .then(r => r.json())
-            .then(data => { if (!data.success) alert('Could not open folder'); })
-            .catch(() => alert('Error opening folder'));
-        menuDropdown.classList.remove('active');
-    };
-})();
-</script>
-
-{% elif view == 'edit' or view == 'new' %}
-    <a href="/" class="back-link">
-        <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-            <path d="m15 18-6-6 6-6"/>
-        </svg>
-        Back to list
-    </a>
-    <h1 class="form-title">{{ 'Edit Snippet' if view == 'edit' else 'Add New Snippet' }}</h1>
-    <form method="POST" action="{{ '/update/' + (snippet.id|urlencode) if view == 'edit' else '/create' }}">
-        {% if view == 'new' %}
-        <div class="form-group">
-            <label class="form-label" for="target_file">Save to Collection</label>
-            <select id="target_file" name="target_file" class="control-select" style="width: 100%;">
-                <option value="">Default (base.yml)</option>
-                {% for file in unique_files %}
-                <option value="{{ file.path }}">{{ file.label }}</option>
-                {% endfor %}
-            </select>
-        </div>
-        {% endif %}
-        <div class="form-group">
-            <label class="form-label" for="trigger">Trigger</label>
-            <input type="text" id="trigger" name="trigger" class="form-input" value="{{ snippet.trigger if snippet else '' }}" placeholder=":trigger">
-        </div>
-        <div class="form-group">
-            <label class="form-label" for="replace">Replacement</label>
-            <textarea id="replace" name="replace" class="form-textarea" rows="10">{{ snippet.replace if snippet else '' }}</textarea>
-        </div>
-        <div class="form-group">
-            <label class="form-label">Options</label>
-            <div class="options-box">
-                <div class="option-item">
-                    <input type="checkbox" id="word" name="word" {{ 'checked' if snippet and snippet.word else '' }}>
-                    <label for="word">Expand only if a whole word</label>
-                </div>
-                <div class="option-item">
-                    <input type="checkbox" id="propagate_case" name="propagate_case" {{ 'checked' if snippet and snippet.propagate_case else '' }}>
-                    <label for="propagate_case">Propagate case</label>
-                </div>
-                <div class="option-item">
-                    <input type="checkbox" id="markdown" name="markdown" {{ 'checked' if snippet and snippet.is_markdown else '' }}>
-                    <label for="markdown">Paste as Markdown</label>
-                </div>
-            </div>
-        </div>
-        <div class="form-actions">
-            <button type="submit" class="btn btn-primary">
-                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                    <path d="M19 21H5a2 2 0 0 1-2-2V5a2 2 0 0 1 2-2h11l5 5v11a2 2 0 0 1-2 2z"></path>
-                    <polyline points="17 21 17 13 7 13 7 21"></polyline>
-                    <polyline points="7 3 7 8 15 8"></polyline>
-                </svg>
-                {{ 'Save Changes' if view == 'edit' else 'Create Snippet' }}
-            </button>
-            <a href="/" class="btn btn-secondary">Cancel</a>
-        </div>
-    </form>
-{% endif %}
-</main>
-</div>
-</body>
-</html>'''
-
-@app.route("/")
-def index():
-    snippets, exists = load_snippets()
-    if not exists: return "Espanso match dir not found"
-
-    unique_files_dict = {}
-    for s in snippets:
-        if s["file"] not in unique_files_dict:
-            unique_files_dict[s["file"]] = s["file_label"]
-
-    unique_files = [{"path": path, "label": label, "relative": str(Path(path).relative_to(MATCH_DIR)) if Path(path).is_relative_to(MATCH_DIR) else path} 
-                    for path, label in sorted(unique_files_dict.items(), key=lambda x: x[1].lower())]
-
-    return render_template_string(TEMPLATE, view="list", snippets=snippets,
-                                  snippet_count=len(snippets),
-                                  unique_files=unique_files,
-                                  msg=request.args.get("msg"), mt=request.args.get("mt"))
-
-@app.route("/new")
-def new_snippet():
-    unique_files = get_yaml_files()
-    return render_template_string(TEMPLATE, view="new", snippet=None, unique_files=unique_files)
-
-@app.route("/edit/<path:snippet_id>")
-def edit_snippet(snippet_id):
-    snippets, _ = load_snippets()
-    full_id = ensure_absolute_path(snippet_id)
-    snippet = next((s for s in snippets if s["id"] == full_id), None)
-    if not snippet: snippet = next((s for s in snippets if s["id"] == snippet_id), None)
-    return render_template_string(TEMPLATE, view="edit", snippet=snippet, unique_files=[])
-
-@app.route("/create", methods=["POST"])
-def create():
-    try:
-        target_file = request.form.get("target_file", "").strip()
-        if not target_file:
-            target_file = MATCH_DIR / "base.yml"
-        else:
-            target_file = Path(target_file)
-        
-        save_snippet(target_file, 0, request.form.get("trigger").strip(),
-                     request.form.get("replace"), "word" in request.form,
-                     "propagate_case" in request.form, "markdown" in request.form, is_new=True)
-        return redirect(url_for("index", msg="Created", mt="success"))
-    except Exception as e: return redirect(url_for("index", msg=str(e), mt="error"))
-
-@app.route("/update/<path:snippet_id>", methods=["POST"])
-def update(snippet_id):
-    try:
-        filepath, index = ensure_absolute_path(snippet_id).rsplit("::", 1)
-        save_snippet(filepath, int(index), request.form.get("trigger").strip(),
-                     request.form.get("replace"), "word" in request.form,
-                     "propagate_case" in request.form, "markdown" in request.form)
-        return redirect(url_for("index", msg="Saved", mt="success"))
-    except Exception as e: return redirect(url_for("index", msg=str(e), mt="error"))
-
-@app.route("/delete/<path:snippet_id>")
-def delete(snippet_id):
-    filepath, index = ensure_absolute_path(snippet_id).rsplit("::", 1)
-    delete_snippet(filepath, int(index))
-    return redirect(url_for("index", msg="Deleted", mt="success"))
-
-@app.route("/open-folder", methods=["POST"])
-def open_folder_route():
-    try:
-        data = request.get_json()
-        filepath = data.get("filepath", "")
-        if not filepath:
-            return jsonify({"success": False, "error": "No filepath provided"})
-        folder_path = Path(filepath).parent
-        success = open_folder(folder_path)
-        return jsonify({"success": success})
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
-
-@app.route("/open-match-dir", methods=["POST"])
-def open_match_dir_route():
-    success = open_folder(MATCH_DIR)
-    return jsonify({"success": success})
-
-@app.route("/create-file", methods=["POST"])
-def create_file_route():
-    try:
-        filename = request.form.get("filename", "").strip()
-        if not filename:
-            return redirect(url_for("index", msg="Filename required", mt="error"))
-        
-        filepath = create_new_file(filename)
-        return redirect(url_for("index", msg=f"Created collection: {filepath.stem}", mt="success"))
-    except FileExistsError as e:
-        return redirect(url_for("index", msg=str(e), mt="error"))
-    except Exception as e:
-        return redirect(url_for("index", msg=str(e), mt="error"))
-
-@app.route("/import", methods=["POST"])
-def import_route():
-    try:
-        if 'file' not in request.files:
-            return redirect(url_for("index", msg="No file selected", mt="error"))
-        
-        file = request.files['file']
-        if file.filename == '':
-            return redirect(url_for("index", msg="No file selected", mt="error"))
-        
-        # Save uploaded file temporarily
-        temp_path = Path("/tmp") / secure_filename(file.filename)
-        file.save(temp_path)
-        
-        import_mode = request.form.get("import_mode", "new")
-        merge_target = request.form.get("merge_target") if import_mode == "merge" else None
-        
-        count, target_path = import_yaml_file(temp_path, merge_target)
-        
-        # Clean up temp file
-        temp_path.unlink()
-        
-        action = "merged into" if merge_target else "imported as"
-        return redirect(url_for("index", msg=f"Imported {count} snippets {action} {target_path.stem}", mt="success"))
-    except Exception as e:
-        return redirect(url_for("index", msg=str(e), mt="error"))
-
-@app.route("/move-snippets", methods=["POST"])
-def move_snippets_route():
-    try:
-        data = request.get_json()
-        snippet_ids = data.get("snippets", [])
-        target = data.get("target", "")
-        
-        if not snippet_ids:
-            return jsonify({"success": False, "error": "No snippets selected"})
-        
-        if not target:
-            return jsonify({"success": False, "error": "No target selected"})
-        
-        # Check if creating new file
-        if target.startswith("_new_:"):
-            new_name = target[6:]
-            target_path = create_new_file(new_name)
-        else:
-            target_path = Path(target)
-        
-        # Decode snippet IDs and move them (in reverse order to handle index shifting)
-        from urllib.parse import unquote
-        decoded_ids = [unquote(sid) for sid in snippet_ids]
-        
-        # Group by file and sort by index descending
-        by_file = {}
-        for sid in decoded_ids:
-            sid = ensure_absolute_path(sid)
-            filepath, index = sid.rsplit("::", 1)
-            if filepath not in by_file:
-                by_file[filepath] = []
-            by_file[filepath].append(int(index))
-        
-        # Sort indices in descending order to avoid index shifting issues
-        moved_count = 0
-        for filepath, indices in by_file.items():
-            for index in sorted(indices, reverse=True):
-                if Path(filepath) != target_path:  # Don't move to same file
-                    move_snippet(filepath, index, target_path)
-                    moved_count += 1
-        
-        return jsonify({"success": True, "message": f"Moved {moved_count} snippet(s) to {target_path.stem}"})
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
-
-@app.route("/export-snippets", methods=["POST"])
-def export_snippets_route():
-    try:
-        data = request.get_json()
-        snippet_ids = data.get("snippets", [])
-        filename = data.get("filename", "export")
-        
-        if not snippet_ids:
-            return jsonify({"success": False, "error": "No snippets selected"})
-        
-        # Decode snippet IDs
-        from urllib.parse import unquote
-        decoded_ids = [ensure_absolute_path(unquote(sid)) for sid in snippet_ids]
-        
-        # Create export file in temp directory
-        if not filename.endswith('.yml'):
-            filename += '.yml'
-        export_path = Path("/tmp") / secure_filename(filename)
-        
-        count = copy_snippets_to_file(decoded_ids, export_path)
-        
-        return jsonify({"success": True, "filename": export_path.name, "count": count})
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
-
-@app.route("/download-export/<filename>")
-def download_export(filename):
-    export_path = Path("/tmp") / secure_filename(filename)
-    if not export_path.exists():
-        return redirect(url_for("index", msg="Export file not found", mt="error"))
-    
-    return send_file(export_path, as_attachment=True, download_name=filename)
-
-if __name__ == "__main__":
-    Timer(1.0, lambda: webbrowser.open("http://localhost:5000")).start()
-    app.run(debug=False, port=5000, host='0.0.0.0')
-"
-import os, sys, webbrowser, subprocess, shutil
-from pathlib import Path
-from threading import Timer
-from datetime import datetime
-from flask import Flask, render_template_string, request, redirect, url_for, jsonify, send_file
-from ruamel.yaml import YAML
-from werkzeug.utils import secure_filename
-
-app = Flask(__name__)
-yaml = YAML()
-yaml.preserve_quotes = True
-yaml.indent(mapping=2, sequence=4, offset=2)
-
-def get_match_dir():
-    if sys.platform == "win32":
-        return Path(os.environ.get("APPDATA", "")) / "espanso" / "match"
-    return Path.home() / ".config" / "espanso" / "match"
-
-MATCH_DIR = get_match_dir()
-
-def ensure_absolute_path(path_str):
-    if sys.platform != "win32" and not path_str.startswith('/'):
-        return '/' + path_str
-    return path_str
-
-def get_file_label(filepath):
-    """Extract meaningful label - use parent folder name if file is named 'package.yml'"""
-    path = Path(filepath)
-    if path.stem.lower() == "package":
-        return path.parent.name
-    return path.stem
-
-def load_snippets():
-    snippets = []
-    if not MATCH_DIR.exists():
-        return snippets, False
-    for f in MATCH_DIR.glob("**/*.yml"):
-        try:
-            with open(f, "r", encoding="utf-8") as fp:
-                data = yaml.load(fp)
-            if data and "matches" in data:
-                for i, m in enumerate(data["matches"]):
-                    is_markdown = False
-                    entry_replace = ""
-
-                    if "markdown" in m:
-                        entry_replace = m["markdown"]
-                        is_markdown = True
-                    else:
-                        entry_replace = m.get("replace", "")
-
-                    if not isinstance(entry_replace, str):
-                        entry_replace = str(entry_replace)
-
-                    snippets.append({
-                        "id": f"{f}::{i}",
-                        "file": str(f),
-                        "file_label": get_file_label(f),
-                        "index": i,
-                        "trigger": m.get("trigger", ""),
-                        "replace": entry_replace,
-                        "word": m.get("word", False),
-                        "propagate_case": m.get("propagate_case", False),
-                        "is_markdown": is_markdown
-                    })
-        except Exception as e:
-            print(f"Error loading {f}: {e}")
-    return snippets, True
-
-def get_yaml_files():
-    """Get list of all YAML files in match directory"""
-    files = []
-    if MATCH_DIR.exists():
-        for f in MATCH_DIR.glob("**/*.yml"):
-            files.append({
-                "path": str(f),
-                "label": get_file_label(f),
-                "relative": str(f.relative_to(MATCH_DIR))
-            })
-    return sorted(files, key=lambda x: x["label"].lower())
-
-def save_snippet(filepath, index, trigger, replace, word, pcase, is_markdown, is_new=False):
-    filepath = Path(filepath)
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-
-    data = {}
-    if filepath.exists():
-        with open(filepath, "r", encoding="utf-8") as f:
-            loaded = yaml.load(f)
-            data = loaded if isinstance(loaded, dict) else {}
-
-    if "matches" not in data:
-        data["matches"] = []
-
-    entry = {"trigger": trigger}
-
-    if is_markdown:
-        entry["markdown"] = replace
-    else:
-        entry["replace"] = replace
-
-    if word: entry["word"] = True
-    if pcase: entry["propagate_case"] = True
-
-    if is_new:
-        data["matches"].append(entry)
-    else:
-        if index < len(data["matches"]):
-            orig = data["matches"][index]
-            for k in orig:
-                if k not in ["trigger", "replace", "markdown", "word", "propagate_case"]:
-                    entry[k] = orig[k]
-            data["matches"][index] = entry
-        else:
-            raise IndexError(f"Index {index} out of range.")
-
-    with open(filepath, "w", encoding="utf-8") as f:
-        yaml.dump(data, f)
-
-def delete_snippet(filepath, index):
-    filepath = Path(filepath)
-    if not filepath.exists(): return
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = yaml.load(f)
-    if data and "matches" in data and index < len(data["matches"]):
-        del data["matches"][index]
-        with open(filepath, "w", encoding="utf-8") as f:
-            yaml.dump(data, f) if data["matches"] else f.write('')
-
-def move_snippet(source_file, source_index, target_file):
-    """Move a snippet from one file to another"""
-    source_path = Path(source_file)
-    target_path = Path(target_file)
-    
-    if not source_path.exists():
-        raise FileNotFoundError(f"Source file not found: {source_file}")
-    
-    # Load source file
-    with open(source_path, "r", encoding="utf-8") as f:
-        source_data = yaml.load(f)
-    
-    if not source_data or "matches" not in source_data:
-        raise ValueError("Source file has no matches")
-    
-    if source_index >= len(source_data["matches"]):
-        raise IndexError(f"Index {source_index} out of range")
-    
-    # Get the snippet to move
-    snippet = source_data["matches"][source_index]
-    
-    # Load or create target file
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    target_data = {}
-    if target_path.exists():
-        with open(target_path, "r", encoding="utf-8") as f:
-            loaded = yaml.load(f)
-            target_data = loaded if isinstance(loaded, dict) else {}
-    
-    if "matches" not in target_data:
-        target_data["matches"] = []
-    
-    # Add to target
-    target_data["matches"].append(snippet)
-    
-    # Remove from source
-    del source_data["matches"][source_index]
-    
-    # Save both files
-    with open(target_path, "w", encoding="utf-8") as f:
-        yaml.dump(target_data, f)
-    
-    with open(source_path, "w", encoding="utf-8") as f:
-        if source_data["matches"]:
-            yaml.dump(source_data, f)
-        else:
-            f.write('')
-
-def copy_snippets_to_file(snippet_ids, target_file):
-    """Copy multiple snippets to a target file (for export)"""
-    target_path = Path(target_file)
-    target_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    target_data = {"matches": []}
-    if target_path.exists():
-        with open(target_path, "r", encoding="utf-8") as f:
-            loaded = yaml.load(f)
-            if loaded and "matches" in loaded:
-                target_data = loaded
-    
-    snippets, _ = load_snippets()
-    snippets_by_id = {s["id"]: s for s in snippets}
-    
-    for sid in snippet_ids:
-        if sid in snippets_by_id:
-            s = snippets_by_id[sid]
-            # Load original entry from file to preserve all fields
-            source_path = Path(s["file"])
-            with open(source_path, "r", encoding="utf-8") as f:
-                source_data = yaml.load(f)
-            if source_data and "matches" in source_data and s["index"] < len(source_data["matches"]):
-                entry = source_data["matches"][s["index"]]
-                target_data["matches"].append(entry)
-    
-    with open(target_path, "w", encoding="utf-8") as f:
-        yaml.dump(target_data, f)
-    
-    return len(snippet_ids)
-
-def import_yaml_file(source_path, merge_into=None):
-    """Import a YAML file into Espanso match directory"""
-    source_path = Path(source_path)
-    
-    if not source_path.exists():
-        raise FileNotFoundError(f"File not found: {source_path}")
-    
-    # Validate it's a valid Espanso file
-    with open(source_path, "r", encoding="utf-8") as f:
-        data = yaml.load(f)
-    
-    if not data or "matches" not in data:
-        raise ValueError("Invalid Espanso file: no 'matches' key found")
-    
-    if merge_into:
-        # Merge into existing file
-        target_path = Path(merge_into)
-        if target_path.exists():
-            with open(target_path, "r", encoding="utf-8") as f:
-                target_data = yaml.load(f)
-            if target_data and "matches" in target_data:
-                target_data["matches"].extend(data["matches"])
-            else:
-                target_data = data
-        else:
-            target_data = data
-        
-        with open(target_path, "w", encoding="utf-8") as f:
-            yaml.dump(target_data, f)
-        
-        return len(data["matches"]), target_path
-    else:
-        # Copy as new file
-        target_name = source_path.stem
-        target_path = MATCH_DIR / f"{target_name}.yml"
-        
-        # Avoid overwriting
-        counter = 1
-        while target_path.exists():
-            target_path = MATCH_DIR / f"{target_name}_{counter}.yml"
-            counter += 1
-        
-        shutil.copy(source_path, target_path)
-        return len(data["matches"]), target_path
-
-def create_new_file(filename):
-    """Create a new empty YAML file"""
-    if not filename.endswith('.yml'):
-        filename += '.yml'
-    
-    # Sanitize filename
-    filename = secure_filename(filename)
-    filepath = MATCH_DIR / filename
-    
-    if filepath.exists():
-        raise FileExistsError(f"File already exists: {filename}")
-    
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Create empty matches file
-    data = {"matches": []}
-    with open(filepath, "w", encoding="utf-8") as f:
-        yaml.dump(data, f)
-    
-    return filepath
-
-def open_folder(folder_path):
-    """Open the folder in the system file manager"""
-    folder_path = Path(folder_path)
-    if not folder_path.exists():
-        return False
-    try:
-        if sys.platform == "win32":
-            subprocess.run(['explorer', str(folder_path)], check=False)
-        elif sys.platform == "darwin":
-            subprocess.run(['open', str(folder_path)], check=False)
-        else:
-            subprocess.run(['xdg-open', str(folder_path)], check=False)
-        return True
-    except Exception as e:
-        print(f"Error opening folder: {e}")
-        return False
-
-TEMPLATE = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1">
-<title>SnippetMaster</title>
-<link rel="preconnect" href="https://fonts.googleapis.com">
-<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-<link href="https://fonts.googleapis.com/css2?family=IBM+Plex+Sans:wght@400;500;600&family=JetBrains+Mono:wght@500&display=swap" rel="stylesheet">
-<style>
-:root {
-    --bg-primary: #0d0d14;
-    --bg-secondary: #16161f;
-    --bg-card: #1e1e2a;
-    --bg-card-hover: #262636;
-    --text-primary: #e8e8ed;
-    --text-secondary: #8b8b9e;
-    --text-muted: #5a5a6e;
-    --accent-blue: #3b82f6;
-    --accent-blue-hover: #2563eb;
-    --accent-green: #22c55e;
-    --accent-green-hover: #16a34a;
-    --accent-red: #ef4444;
-    --accent-red-hover: #dc2626;
-    --accent-purple: #a855f7;
-    --accent-purple-hover: #9333ea;
-    --border-color: #2a2a3a;
-    --badge-bg: #2a2a3a;
-    --badge-text: #a0a0b8;
-    --badge-yellow-bg: #422006;
-    --badge-yellow-text: #fbbf24;
-    --badge-blue-bg: #172554;
-    --badge-blue-text: #60a5fa;
-    --shadow: 0 4px 20px rgba(0, 0, 0, 0.4);
-    --radius: 8px;
-    --radius-lg: 12px;
-}
-
-* { box-sizing: border-box; margin: 0; padding: 0; }
-
-body {
-    font-family: 'IBM Plex Sans', -apple-system, BlinkMacSystemFont, sans-serif;
-    background: var(--bg-primary);
-    color: var(--text-primary);
-    min-height: 100vh;
-    line-height: 1.5;
-}
-
-.container { max-width: 1200px; margin: 0 auto; padding: 24px 32px; }
-
-header {
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    padding-bottom: 24px;
-    margin-bottom: 24px;
-    border-bottom: 1px solid var(--border-color);
-}
-
-.header-left { display: flex; align-items: baseline; gap: 12px; }
-
-.logo {
-    font-size: 1.5rem;
-    font-weight: 600;
-    color: var(--text-primary);
-    text-decoration: none;
-    display: flex;
-    align-items: center;
-    gap: 8px;
-}
-
-.logo:hover { color: var(--accent-blue); }
-
-.snippet-count { font-size: 0.95rem; color: var(--text-secondary); font-weight: 400; }
-
-.header-right { display: flex; align-items: center; gap: 12px; }
-
-.search-container { position: relative; }
-
-.search-icon {
-    position: absolute;
-    left: 14px;
-    top: 50%;
-    transform: translateY(-50%);
-    color: var(--text-muted);
-    pointer-events: none;
-}
-
-.search-input {
-    width: 240px;
-    padding: 10px 16px 10px 42px;
-    background: var(--bg-secondary);
-    border: 1px solid var(--border-color);
-    border-radius: var(--radius);
-    color: var(--text-primary);
-    font-size: 0.9rem;
-    font-family: inherit;
-    transition: all 0.2s ease;
-}
-
-.search-input::placeholder { color: var(--text-muted); }
-.search-input:focus { outline: none; border-color: var(--accent-blue); background: var(--bg-card); }
-
-.btn {
-    padding: 10px 18px;
-    border-radius: var(--radius);
-    border: none;
-    font-size: 0.9rem;
-    font-weight: 500;
-    font-family: inherit;
-    cursor: pointer;
-    transition: all 0.2s ease;
-    display: inline-flex;
-    align-items: center;
-    gap: 8px;
-    text-decoration: none;
-}
-
-.btn-primary { background: var(--accent-blue); color: white; }
-.btn-primary:hover { background: var(--accent-blue-hover); transform: translateY(-1px); }
-
-.btn-secondary { background: var(--bg-card); color: var(--text-primary); border: 1px solid var(--border-color); }
-.btn-secondary:hover { background: var(--bg-card-hover); border-color: var(--text-muted); }
-
-.btn-success { background: var(--accent-green); color: white; }
-.btn-success:hover { background: var(--accent-green-hover); }
-
-.btn-purple { background: var(--accent-purple); color: white; }
-.btn-purple:hover { background: var(--accent-purple-hover); }
-
-.btn-danger { background: var(--accent-red); color: white; }
-.btn-danger:hover { background: var(--accent-red-hover); }
-
-.btn-icon { width: 38px; height: 38px; padding: 0; display: flex; align-items: center; justify-content: center; border-radius: var(--radius); }
-
-.btn-sm { padding: 6px 12px; font-size: 0.8rem; }
-
-.controls-bar {
-    display: flex;
-    align-items: center;
-    gap: 12px;
-    margin-bottom: 20px;
-    flex-wrap: wrap;
-}
-
-.control-select {
-    padding: 10px 36px 10px 16px;
-    background: var(--bg-card);
-    border: 1px solid var(--border-color);
-    border-radius: var(--radius);
-    color: var(--text-primary);
-    font-size: 0.9rem;
-    font-family: inherit;
-    cursor: pointer;
-    appearance: none;
-    background-image: url("data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='12' height='12' viewBox='0 0 24 24' fill='none' stroke='%238b8b9e' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'%3E%3Cpolyline points='6 9 12 15 18 9'%3E%3C/polyline%3E%3C/svg%3E");
-    background-repeat: no-repeat;
-    background-position: right 12px center;
-    transition: all 0.2s ease;
-}
-
-.control-select:hover { border-color: var(--text-muted); }
-.control-select:focus { outline: none; border-color: var(--accent-blue); }
-
-.btn-folder { background: var(--bg-card); color: var(--text-primary); border: 1px solid var(--border-color); display: none; }
-.btn-folder:hover { background: var(--bg-card-hover); border-color: var(--text-muted); }
-
-.filtered-count { font-size: 0.9rem; color: var(--text-secondary); margin-left: auto; }
-
-/* Selection Mode */
-.selection-bar {
-    display: none;
-    align-items: center;
-    gap: 12px;
-    padding: 12px 16px;
-    background: var(--bg-secondary);
-    border: 1px solid var(--accent-purple);
-    border-radius: var(--radius);
-    margin-bottom: 16px;
-}
-
-.selection-bar.active { display: flex; }
-
-.selection-count { font-weight: 500; color: var(--accent-purple); }
-
-.snippet-checkbox {
-    width: 20px;
-    height: 20px;
-    accent-color: var(--accent-purple);
-    cursor: pointer;
-    margin-right: 12px;
-    display: none;
-}
-
-.selection-mode .snippet-checkbox { display: block; }
-.selection-mode .snippet-card { cursor: default; }
-.selection-mode .snippet-card:hover { transform: none; }
-
-#snippet-list { display: flex; flex-direction: column; gap: 10px; }
-
-.snippet-card {
-    background: var(--bg-card);
-    border: 1px solid var(--border-color);
-    border-radius: var(--radius-lg);
-    padding: 16px 20px;
-    cursor: pointer;
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    transition: all 0.2s ease;
-    position: relative;
-}
-
-.snippet-card:hover { background: var(--bg-card-hover); border-color: var(--text-muted); transform: translateX(2px); }
-.snippet-card.selected { border-color: var(--accent-purple); background: rgba(168, 85, 247, 0.1); }
-
-.snippet-content { flex: 1; min-width: 0; display: flex; align-items: center; }
-.snippet-info { flex: 1; min-width: 0; }
-
-.snippet-header { display: flex; align-items: center; gap: 10px; margin-bottom: 8px; flex-wrap: wrap; }
-
-.snippet-trigger { font-family: 'JetBrains Mono', monospace; font-weight: 500; font-size: 1rem; color: var(--accent-blue); }
-
-.badge { padding: 3px 8px; font-size: 0.75rem; font-weight: 500; border-radius: 4px; background: var(--badge-bg); color: var(--badge-text); }
-.badge-file { background: var(--badge-bg); color: var(--badge-text); }
-.badge-word { background: var(--badge-bg); color: var(--badge-text); }
-.badge-case { background: var(--badge-bg); color: var(--badge-text); }
-.badge-md { background: var(--badge-blue-bg); color: var(--badge-blue-text); }
-
-.snippet-preview { font-size: 0.9rem; color: var(--text-secondary); white-space: nowrap; overflow: hidden; text-overflow: ellipsis; max-width: 600px; }
-
-.snippet-actions { display: flex; gap: 8px; opacity: 0; transition: opacity 0.2s ease; }
-.snippet-card:hover .snippet-actions { opacity: 1; }
-
-.btn-edit { background: var(--bg-secondary); color: var(--text-primary); border: 1px solid var(--border-color); }
-.btn-edit:hover { background: var(--accent-blue); border-color: var(--accent-blue); }
-
-.btn-delete { background: var(--accent-red); color: white; }
-.btn-delete:hover { background: var(--accent-red-hover); }
-
-.message {
-    padding: 14px 18px;
-    border-radius: var(--radius);
-    margin-bottom: 20px;
-    display: flex;
-    align-items: center;
-    gap: 10px;
-    font-weight: 500;
-}
-
-.message-success { background: rgba(34, 197, 94, 0.15); border: 1px solid rgba(34, 197, 94, 0.3); color: var(--accent-green); }
-.message-error { background: rgba(239, 68, 68, 0.15); border: 1px solid rgba(239, 68, 68, 0.3); color: var(--accent-red); }
-
-.empty-state { text-align: center; padding: 80px 20px; color: var(--text-secondary); }
-.empty-state h2 { font-size: 1.5rem; color: var(--text-primary); margin-bottom: 12px; }
-.empty-state p { font-size: 1rem; }
-
-.back-link {
-    display: inline-flex;
-    align-items: center;
-    gap: 6px;
-    color: var(--text-secondary);
-    text-decoration: none;
-    font-size: 0.9rem;
-    margin-bottom: 24px;
-    transition: color 0.2s ease;
-}
-
-.back-link:hover { color: var(--accent-blue); }
-
-.form-title { font-size: 1.75rem; font-weight: 600; margin-bottom: 32px; color: var(--text-primary); }
-
-.form-group { margin-bottom: 24px; }
-
-.form-label { display: block; font-size: 0.9rem; font-weight: 500; color: var(--text-secondary); margin-bottom: 8px; }
-
-.form-input, .form-textarea {
-    width: 100%;
-    padding: 12px 16px;
-    background: var(--bg-secondary);
-    border: 1px solid var(--border-color);
-    border-radius: var(--radius);
-    color: var(--text-primary);
-    font-size: 0.95rem;
-    font-family: inherit;
-    transition: all 0.2s ease;
-}
-
-.form-textarea { font-family: 'JetBrains Mono', monospace; font-size: 0.9rem; resize: vertical; min-height: 200px; }
-
-.form-input:focus, .form-textarea:focus { outline: none; border-color: var(--accent-blue); background: var(--bg-card); }
-.form-input::placeholder, .form-textarea::placeholder { color: var(--text-muted); }
-
-.options-box { background: var(--bg-secondary); border: 1px solid var(--border-color); border-radius: var(--radius); padding: 16px 20px; }
-
-.option-item { display: flex; align-items: center; gap: 10px; padding: 8px 0; }
-.option-item:not(:last-child) { border-bottom: 1px solid var(--border-color); }
-.option-item input[type="checkbox"] { width: 18px; height: 18px; accent-color: var(--accent-blue); cursor: pointer; }
-.option-item label { font-size: 0.9rem; color: var(--text-primary); cursor: pointer; }
-
-.form-actions { margin-top: 32px; display: flex; gap: 12px; }
-
-/* Modal */
-.modal-overlay {
-    display: none;
-    position: fixed;
-    top: 0;
-    left: 0;
-    right: 0;
-    bottom: 0;
-    background: rgba(0, 0, 0, 0.7);
-    z-index: 1000;
-    align-items: center;
-    justify-content: center;
-}
-
-.modal-overlay.active { display: flex; }
-
-.modal {
-    background: var(--bg-card);
-    border: 1px solid var(--border-color);
-    border-radius: var(--radius-lg);
-    padding: 24px;
-    max-width: 500px;
-    width: 90%;
-    max-height: 80vh;
-    overflow-y: auto;
-}
-
-.modal-title { font-size: 1.25rem; font-weight: 600; margin-bottom: 20px; }
-
-.modal-actions { display: flex; gap: 12px; margin-top: 24px; justify-content: flex-end; }
-
-/* File list in modal */
-.file-list { max-height: 300px; overflow-y: auto; margin: 16px 0; }
-
-.file-item {
-    padding: 12px 16px;
-    background: var(--bg-secondary);
-    border: 1px solid var(--border-color);
-    border-radius: var(--radius);
-    margin-bottom: 8px;
-    cursor: pointer;
-    transition: all 0.2s ease;
-    display: flex;
-    align-items: center;
-    gap: 10px;
-}
-
-.file-item:hover { border-color: var(--accent-blue); background: var(--bg-card-hover); }
-.file-item.selected { border-color: var(--accent-purple); background: rgba(168, 85, 247, 0.15); }
-
-.file-item-label { font-weight: 500; }
-.file-item-path { font-size: 0.8rem; color: var(--text-muted); }
-
-/* File input styling */
-.file-input-wrapper { position: relative; }
-
-.file-input-wrapper input[type="file"] {
-    position: absolute;
-    width: 100%;
-    height: 100%;
-    opacity: 0;
-    cursor: pointer;
-}
-
-.file-input-label {
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    gap: 10px;
-    padding: 40px 20px;
-    background: var(--bg-secondary);
-    border: 2px dashed var(--border-color);
-    border-radius: var(--radius);
-    color: var(--text-secondary);
-    transition: all 0.2s ease;
-}
-
-.file-input-wrapper:hover .file-input-label { border-color: var(--accent-blue); color: var(--accent-blue); }
-
-.selected-file { margin-top: 12px; padding: 10px 14px; background: var(--bg-secondary); border-radius: var(--radius); font-size: 0.9rem; }
-
-/* Dropdown menu */
-.dropdown { position: relative; }
-
-.dropdown-menu {
-    display: none;
-    position: absolute;
-    top: 100%;
-    right: 0;
-    margin-top: 8px;
-    background: var(--bg-card);
-    border: 1px solid var(--border-color);
-    border-radius: var(--radius);
-    min-width: 180px;
-    z-index: 100;
-    box-shadow: var(--shadow);
-}
-
-.dropdown-menu.active { display: block; }
-
-.dropdown-item {
-    display: flex;
-    align-items: center;
-    gap: 10px;
-    padding: 12px 16px;
-    color: var(--text-primary);
-    text-decoration: none;
-    transition: background 0.2s ease;
-    cursor: pointer;
-    border: none;
-    background: none;
-    width: 100%;
-    font-size: 0.9rem;
-    font-family: inherit;
-}
-
-.dropdown-item:hover { background: var(--bg-card-hover); }
-.dropdown-item:first-child { border-radius: var(--radius) var(--radius) 0 0; }
-.dropdown-item:last-child { border-radius: 0 0 var(--radius) var(--radius); }
-
-.dropdown-divider { height: 1px; background: var(--border-color); margin: 4px 0; }
-
-@media (max-width: 768px) {
-    .container { padding: 16px; }
-    header { flex-direction: column; gap: 16px; align-items: flex-start; }
-    .header-right { width: 100%; flex-direction: column; align-items: stretch; }
-    .search-input { width: 100%; }
-    .controls-bar { flex-direction: column; align-items: stretch; }
-    .control-select { width: 100%; }
-    .filtered-count { margin-left: 0; text-align: center; }
-    .snippet-actions { opacity: 1; }
-    .snippet-preview { max-width: 100%; }
-}
-</style>
-</head>
-<body>
-<div class="container">
-<header>
-<div class="header-left">
-    <a href="/" class="logo">
-        <span>⌨</span>
-        <span>SnippetMaster</span>
-    </a>
-    {% if snippet_count is defined %}<span class="snippet-count">({{ snippet_count }} snippet{{ 's' if snippet_count != 1 else '' }})</span>{% endif %}
-</div>
-{% if view != 'error' %}
-<div class="header-right">
-    <div class="search-container">
-        <svg class="search-icon" width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-            <circle cx="11" cy="11" r="8"></circle>
-            <path d="m21 21-4.35-4.35"></path>
-        </svg>
-        <input type="text" id="search-input" class="search-input" placeholder="Search">
-    </div>
-    <a href="/new" class="btn btn-primary">
-        <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5" stroke-linecap="round" stroke-linejoin="round">
-            <path d="M12 5v14M5 12h14"/>
-        </svg>
-        Add New
-    </a>
-    <div class="dropdown">
-        <button class="btn btn-secondary" id="menu-btn">
-            <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                <circle cx="12" cy="12" r="1"></circle>
-                <circle cx="12" cy="5" r="1"></circle>
-                <circle cx="12" cy="19" r="1"></circle>
-            </svg>
-            More
-        </button>
-        <div class="dropdown-menu" id="menu-dropdown">
-            <button class="dropdown-item" onclick="openModal('new-file-modal')">
-                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                    <path d="M14 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V8z"></path>
-                    <polyline points="14 2 14 8 20 8"></polyline>
-                    <line x1="12" y1="18" x2="12" y2="12"></line>
-                    <line x1="9" y1="15" x2="15" y2="15"></line>
-                </svg>
-                New Collection
-            </button>
-            <button class="dropdown-item" onclick="openModal('import-modal')">
-                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                    <path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>
-                    <polyline points="7 10 12 15 17 10"></polyline>
-                    <line x1="12" y1="15" x2="12" y2="3"></line>
-                </svg>
-                Import Collection
-            </button>
-            <div class="dropdown-divider"></div>
-            <button class="dropdown-item" id="toggle-selection-btn" onclick="toggleSelectionMode()">
-                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                    <polyline points="9 11 12 14 22 4"></polyline>
-                    <path d="M21 12v7a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2V5a2 2 0 0 1 2-2h11"></path>
-                </svg>
-                Select Snippets
-            </button>
-            <div class="dropdown-divider"></div>
-            <button class="dropdown-item" onclick="openMatchDir()">
-                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                    <path d="M22 19a2 2 0 0 1-2 2H4a2 2 0 0 1-2-2V5a2 2 0 0 1 2-2h5l2 3h9a2 2 0 0 1 2 2z"></path>
-                </svg>
-                Open Espanso Folder
-            </button>
-        </div>
-    </div>
-</div>
-{% endif %}
-</header>
-
-<main>
-{% if msg %}
-<div class="message {{ 'message-success' if mt == 'success' else 'message-error' }}">
-    <svg width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-        {% if mt == 'success' %}
-        <path d="M22 11.08V12a10 10 0 1 1-5.93-9.14"></path>
-        <polyline points="22 4 12 14.01 9 11.01"></polyline>
-        {% else %}
-        <circle cx="12" cy="12" r="10"></circle>
-        <path d="m15 9-6 6M9 9l6 6"/>
-        {% endif %}
-    </svg>
-    <span>{{ msg }}</span>
-</div>
-{% endif %}
-
-{% if view == 'list' %}
-    <!-- Selection Bar -->
-    <div class="selection-bar" id="selection-bar">
-        <span class="selection-count"><span id="selected-count">0</span> selected</span>
-        <button class="btn btn-sm btn-purple" onclick="openMoveModal()">
-            <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                <path d="M5 12h14M12 5l7 7-7 7"/>
-            </svg>
-            Move to...
-        </button>
-        <button class="btn btn-sm btn-success" onclick="openExportModal()">
-            <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                <path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>
-                <polyline points="17 8 12 3 7 8"></polyline>
-                <line x1="12" y1="3" x2="12" y2="15"></line>
-            </svg>
-            Export...
-        </button>
-        <button class="btn btn-sm btn-secondary" onclick="toggleSelectionMode()">Cancel</button>
-    </div>
-
-    {% if snippets %}
-    <div class="controls-bar">
-        <select id="filter-file" class="control-select">
-            <option value="all">Collection: All files</option>
-            {% for file in unique_files %}
-            <option value="{{ file.path }}">Collection: {{ file.label }}</option>
-            {% endfor %}
-        </select>
-        <select id="sort-order" class="control-select">
-            <option value="asc">Sort: A → Z</option>
-            <option value="desc">Sort: Z → A</option>
-        </select>
-        <button id="btn-open-folder" class="btn btn-folder" title="Open folder in file manager">
-            <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                <path d="M22 19a2 2 0 0 1-2 2H4a2 2 0 0 1-2-2V5a2 2 0 0 1 2-2h5l2 3h9a2 2 0 0 1 2 2z"></path>
-            </svg>
-            Open Folder
-        </button>
-        <span id="filtered-count" class="filtered-count"></span>
-    </div>
-
-    <div id="snippet-list">
-        {% for s in snippets %}
-        <div class="snippet-card" data-file="{{ s.file }}" data-trigger="{{ s.trigger|lower }}" data-id="{{ s.id|urlencode }}">
-            <div class="snippet-content">
-                <input type="checkbox" class="snippet-checkbox" data-id="{{ s.id|urlencode }}" onclick="event.stopPropagation(); updateSelectionCount();">
-                <div class="snippet-info">
-                    <div class="snippet-header">
-                        <span class="snippet-trigger">{{ s.trigger }}</span>
-                        <span class="badge badge-file">{{ s.file_label }}</span>
-                        {% if s.word %}<span class="badge badge-word">word</span>{% endif %}
-                        {% if s.propagate_case %}<span class="badge badge-case">case</span>{% endif %}
-                        {% if s.is_markdown %}<span class="badge badge-md">md</span>{% endif %}
-                    </div>
-                    <div class="snippet-preview">Expansion: {{ s.replace.split('\n')[0][:80] }}</div>
-                </div>
-            </div>
-            <div class="snippet-actions">
-                <a href="/edit/{{ s.id|urlencode }}" class="btn btn-icon btn-edit" onclick="event.stopPropagation();" title="Edit">
-                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                        <path d="M11 4H4a2 2 0 0 0-2 2v14a2 2 0 0 0 2 2h14a2 2 0 0 0 2-2v-7"></path>
-                        <path d="M18.5 2.5a2.121 2.121 0 0 1 3 3L12 15l-4 1 1-4 9.5-9.5z"></path>
-                    </svg>
-                </a>
-                <a href="/delete/{{ s.id|urlencode }}" class="btn btn-icon btn-delete" onclick="event.stopPropagation();" title="Delete">
-                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                        <polyline points="3 6 5 6 21 6"></polyline>
-                        <path d="M19 6v14a2 2 0 0 1-2 2H7a2 2 0 0 1-2-2V6m3 0V4a2 2 0 0 1 2-2h4a2 2 0 0 1 2 2v2"></path>
-                    </svg>
-                </a>
-            </div>
-        </div>
-        {% endfor %}
-    </div>
-    {% else %}
-        <div class="empty-state">
-            <h2>No snippets yet</h2>
-            <p>Click <strong>+ Add New</strong> to create your first snippet, or import an existing collection.</p>
-        </div>
-    {% endif %}
-
-<!-- New File Modal -->
-<div class="modal-overlay" id="new-file-modal">
-    <div class="modal">
-        <h2 class="modal-title">Create New Collection</h2>
-        <form id="new-file-form" action="/create-file" method="POST">
-            <div class="form-group">
-                <label class="form-label" for="new-filename">Collection Name</label>
-                <input type="text" id="new-filename" name="filename" class="form-input" placeholder="my-snippets" required>
-                <p style="font-size: 0.8rem; color: var(--text-muted); margin-top: 8px;">.yml extension will be added automatically</p>
-            </div>
-            <div class="modal-actions">
-                <button type="button" class="btn btn-secondary" onclick="closeModal('new-file-modal')">Cancel</button>
-                <button type="submit" class="btn btn-primary">Create</button>
-            </div>
-        </form>
-    </div>
-</div>
-
-<!-- Import Modal -->
-<div class="modal-overlay" id="import-modal">
-    <div class="modal">
-        <h2 class="modal-title">Import Collection</h2>
-        <form id="import-form" action="/import" method="POST" enctype="multipart/form-data">
-            <div class="form-group">
-                <label class="form-label">Select YAML file</label>
-                <div class="file-input-wrapper">
-                    <input type="file" id="import-file" name="file" accept=".yml,.yaml" required onchange="updateFileLabel(this)">
-                    <div class="file-input-label">
-                        <svg width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                            <path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>
-                            <polyline points="7 10 12 15 17 10"></polyline>
-                            <line x1="12" y1="15" x2="12" y2="3"></line>
-                        </svg>
-                        <span>Click to select or drag and drop</span>
-                    </div>
-                </div>
-                <div id="selected-file-name" class="selected-file" style="display: none;"></div>
-            </div>
-            <div class="form-group">
-                <label class="form-label">Import as</label>
-                <div class="option-item" style="padding: 0;">
-                    <input type="radio" id="import-new" name="import_mode" value="new" checked>
-                    <label for="import-new">New collection (keep original filename)</label>
-                </div>
-                <div class="option-item" style="border: none;">
-                    <input type="radio" id="import-merge" name="import_mode" value="merge">
-                    <label for="import-merge">Merge into existing collection</label>
-                </div>
-                <select id="merge-target" name="merge_target" class="control-select" style="width: 100%; margin-top: 8px; display: none;">
-                    {% for file in unique_files %}
-                    <option value="{{ file.path }}">{{ file.label }}</option>
-                    {% endfor %}
-                </select>
-            </div>
-            <div class="modal-actions">
-                <button type="button" class="btn btn-secondary" onclick="closeModal('import-modal')">Cancel</button>
-                <button type="submit" class="btn btn-success">Import</button>
-            </div>
-        </form>
-    </div>
-</div>
-
-<!-- Move Modal -->
-<div class="modal-overlay" id="move-modal">
-    <div class="modal">
-        <h2 class="modal-title">Move Snippets</h2>
-        <p style="color: var(--text-secondary); margin-bottom: 16px;">Select destination collection:</p>
-        <div class="file-list" id="move-file-list">
-            {% for file in unique_files %}
-            <div class="file-item" data-path="{{ file.path }}" onclick="selectMoveTarget(this)">
-                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                    <path d="M14 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V8z"></path>
-                    <polyline points="14 2 14 8 20 8"></polyline>
-                </svg>
-                <div>
-                    <div class="file-item-label">{{ file.label }}</div>
-                    <div class="file-item-path">{{ file.relative }}</div>
-                </div>
-            </div>
-            {% endfor %}
-        </div>
-        <div style="margin-top: 12px;">
-            <button class="btn btn-sm btn-secondary" onclick="showNewFileInMove()">
-                <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                    <path d="M12 5v14M5 12h14"/>
-                </svg>
-                Create new collection
-            </button>
-        </div>
-        <div id="move-new-file" style="display: none; margin-top: 12px;">
-            <input type="text" id="move-new-filename" class="form-input" placeholder="new-collection-name">
-        </div>
-        <div class="modal-actions">
-            <button type="button" class="btn btn-secondary" onclick="closeModal('move-modal')">Cancel</button>
-            <button type="button" class="btn btn-purple" id="move-confirm-btn" onclick="confirmMove()">Move</button>
-        </div>
-    </div>
-</div>
-
-<!-- Export Modal -->
-<div class="modal-overlay" id="export-modal">
-    <div class="modal">
-        <h2 class="modal-title">Export Snippets</h2>
-        <p style="color: var(--text-secondary); margin-bottom: 16px;">Export selected snippets to a new file for sharing.</p>
-        <div class="form-group">
-            <label class="form-label" for="export-filename">Export filename</label>
-            <input type="text" id="export-filename" class="form-input" placeholder="shared-snippets" value="shared-snippets">
-            <p style="font-size: 0.8rem; color: var(--text-muted); margin-top: 8px;">.yml extension will be added automatically</p>
-        </div>
-        <div class="modal-actions">
-            <button type="button" class="btn btn-secondary" onclick="closeModal('export-modal')">Cancel</button>
-            <button type="button" class="btn btn-success" onclick="confirmExport()">Export & Download</button>
-        </div>
-    </div>
-</div>
-
-<script>
-(function() {
-    const filterSelect = document.getElementById('filter-file');
-    const sortSelect = document.getElementById('sort-order');
-    const openFolderBtn = document.getElementById('btn-open-folder');
-    const filteredCountSpan = document.getElementById('filtered-count');
-    const snippetList = document.getElementById('snippet-list');
-    const searchInput = document.getElementById('search-input');
-    const cards = snippetList ? Array.from(snippetList.querySelectorAll('.snippet-card')) : [];
-    const menuBtn = document.getElementById('menu-btn');
-    const menuDropdown = document.getElementById('menu-dropdown');
+    function measureRow() {
+        if (pool.length && pool[0].style.display !== 'none') {
+            const h = pool[0].offsetHeight + 10;
+            if (h > 10 && h !== rowHeight) { rowHeight = h; renderWindow(); }
+        }
+    }
 
     let searchQuery = '';
     let selectionMode = false;
 
+    // Precomputed search index: trigger + preview of every snippet lowercased
+    // into one blob, so a keystroke costs a single indexOf scan instead of
+    // N DOM reads. \x1f separates entries, \x1e separates trigger/preview.
+    const searchTexts = snippetData.map(d =>
+        d.lt + '\x1eexpansion: ' + d.p.toLowerCase());
+    const searchOffsets = [];
+    let searchBlob = '';
+    for (let i = 0, n = searchTexts.length; i < n; i++) {
+        searchOffsets.push(searchBlob.length);
+        searchBlob += searchTexts[i] + '\x1f';
+    }
+
+    function searchMatches(query) {
+        const hits = new Set();
+        let p = searchBlob.indexOf(query);
+        while (p !== -1) {
+            let lo = 0, hi = searchOffsets.length - 1;
+            while (lo < hi) {
+                const mid = (lo + hi + 1) >> 1;
+                if (searchOffsets[mid] <= p) lo = mid; else hi = mid - 1;
+            }
+            hits.add(lo);
+            p = searchBlob.indexOf(query, searchOffsets[lo] + searchTexts[lo].length + 1);
+        }
+        return hits;
+    }
+
     // Dropdown menu
     if (menuBtn) {
         menuBtn.addEventListener('click', (e) => {
@@ -2620,19 +1549,34 @@ header {
         document.addEventListener('click', () => menuDropdown.classList.remove('active'));
     }
 
-    // Click handler for cards
-    cards.forEach(card => {
-        card.addEventListener('click', function(e) {
+    // Card events are delegated: pooled nodes are re-bound constantly, so
+    // per-node listeners would go stale.
+    function setSelected(qid, on, card) {
+        if (on) selectedIds.add(qid); else selectedIds.delete(qid);
+        if (card) card.classList.toggle('selected', on);
+        updateSelectionCount();
+    }
+
+    if (snippetList) {
+        snippetList.addEventListener('click', function(e) {
+            const card = e.target.closest('.snippet-card');
+            if (!card) return;
+            if (e.target.closest('.snippet-checkbox')) return;
+            if (e.target.closest('.snippet-actions')) return;
             if (selectionMode) {
-                const checkbox = this.querySelector('.snippet-checkbox');
-                checkbox.checked = !checkbox.checked;
-                this.classList.toggle('selected', checkbox.checked);
-                updateSelectionCount();
-            } else if (!e.target.closest('.snippet-actions')) {
-                location.href = '/edit/' + this.dataset.id;
+                const cb = card.querySelector('.snippet-checkbox');
+                cb.checked = !cb.checked;
+                setSelected(cb.dataset.id, cb.checked, card);
+            } else {
+                location.href = '/edit/' + card.dataset.id;
             }
         });
-    });
+        snippetList.addEventListener('change', function(e) {
+            if (!e.target.classList.contains('snippet-checkbox')) return;
+            setSelected(e.target.dataset.id, e.target.checked,
+                        e.target.closest('.snippet-card'));
+        });
+    }
 
     function applyFilterAndSort() {
         if (!filterSelect || !sortSelect) return;
@@ -2649,28 +1593,21 @@ header {
             }
         }
 
-        let visibleCards = cards.filter(card => {
-            const matchesFile = filterValue === 'all' || card.dataset.file === filterValue;
-            const matchesSearch = !searchQuery ||
-                card.dataset.trigger.includes(searchQuery.toLowerCase()) ||
-                card.querySelector('.snippet-preview').textContent.toLowerCase().includes(searchQuery.toLowerCase());
-            return matchesFile && matchesSearch;
-        });
-
-        visibleCards.sort((a, b) => {
-            const triggerA = a.dataset.trigger;
-            const triggerB = b.dataset.trigger;
-            return sortValue === 'asc' ? triggerA.localeCompare(triggerB) : triggerB.localeCompare(triggerA);
-        });
+        const hits = searchQuery ? searchMatches(searchQuery.toLowerCase()) : null;
+        const base = sortValue === 'asc' ? ascOrder : descOrder;
+        if (!hits && filterValue === 'all') {
+            order = base;   // default view: reuse the precomputed order as-is
+        } else {
+            order = base.filter(i => {
+                const d = snippetData[i];
+                return (filterValue === 'all' || d.f === filterValue) && (!hits || hits.has(i));
+            });
+        }
 
-        cards.forEach(card => card.style.display = 'none');
-        visibleCards.forEach(card => {
-            card.style.display = 'flex';
-            snippetList.appendChild(card);
-        });
+        renderWindow();
 
-        const total = cards.length;
-        const visible = visibleCards.length;
+        const total = snippetData.length;
+        const visible = order.length;
         if (filteredCountSpan) {
             filteredCountSpan.textContent = (filterValue === 'all' && !searchQuery) ? '' : `Showing ${visible} of ${total}`;
         }
@@ -2678,7 +1615,13 @@ header {
 
     if (filterSelect) filterSelect.addEventListener('change', applyFilterAndSort);
     if (sortSelect) sortSelect.addEventListener('change', applyFilterAndSort);
-    if (searchInput) searchInput.addEventListener('input', function() { searchQuery = this.value; applyFilterAndSort(); });
+    // Debounced so fast typing re-filters once, not per keystroke.
+    let searchTimer;
+    if (searchInput) searchInput.addEventListener('input', function() {
+        clearTimeout(searchTimer);
+        const value = this.value;
+        searchTimer = setTimeout(() => { searchQuery = value; applyFilterAndSort(); }, 50);
+    });
 
     if (openFolderBtn) {
         openFolderBtn.addEventListener('click', function() {
@@ -2695,28 +1638,40 @@ header {
         });
     }
 
+    let scrollPending = false;
+    window.addEventListener('scroll', () => {
+        if (scrollPending) return;
+        scrollPending = true;
+        requestAnimationFrame(() => { scrollPending = false; renderWindow(); });
+    }, { passive: true });
+    window.addEventListener('resize', renderWindow);
+
     applyFilterAndSort();
+    measureRow();
+    window.addEventListener('load', measureRow);
 
     // Selection mode
     window.toggleSelectionMode = function() {
         selectionMode = !selectionMode;
         document.body.classList.toggle('selection-mode', selectionMode);
-        document.getElementById('selection-bar').classList.toggle('active', selectionMode);
-        document.getElementById('toggle-selection-btn').innerHTML = selectionMode ? 
+        selectionBar.classList.toggle('active', selectionMode);
+        toggleSelectionBtn.innerHTML = selectionMode ? 
             '<svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M18 6L6 18M6 6l12 12"/></svg> Cancel Selection' :
             '<svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="9 11 12 14 22 4"></polyline><path d="M21 12v7a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2V5a2 2 0 0 1 2-2h11"></path></svg> Select Snippets';
         
         if (!selectionMode) {
-            document.querySelectorAll('.snippet-checkbox').forEach(cb => cb.checked = false);
-            document.querySelectorAll('.snippet-card').forEach(card => card.classList.remove('selected'));
+            selectedIds.clear();
+            for (let k = 0, np = pool.length; k < np; k++) {
+                pool[k].querySelector('.snippet-checkbox').checked = false;
+                pool[k].classList.remove('selected');
+            }
             updateSelectionCount();
         }
         menuDropdown.classList.remove('active');
     };
 
     window.updateSelectionCount = function() {
-        const count = document.querySelectorAll('.snippet-checkbox:checked').length;
-        document.getElementById('selected-count').textContent = count;
+        selectedCountEl.textContent = selectedIds.size;
     };
 
     // Modals
@@ -2761,30 +1716,30 @@ header {
     window.openMoveModal = function() {
         selectedMoveTarget = null;
         createNewInMove = false;
-        document.querySelectorAll('#move-file-list .file-item').forEach(item => item.classList.remove('selected'));
-        document.getElementById('move-new-file').style.display = 'none';
-        document.getElementById('move-new-filename').value = '';
+        moveFileItems.forEach(item => item.classList.remove('selected'));
+        moveNewFile.style.display = 'none';
+        moveNewFilename.value = '';
         openModal('move-modal');
     };
 
     window.selectMoveTarget = function(el) {
-        document.querySelectorAll('#move-file-list .file-item').forEach(item => item.classList.remove('selected'));
+        moveFileItems.forEach(item => item.classList.remove('selected'));
         el.classList.add('selected');
         selectedMoveTarget = el.dataset.path;
         createNewInMove = false;
-        document.getElementById('move-new-file').style.display = 'none';
+        moveNewFile.style.display = 'none';
     };
 
     window.showNewFileInMove = function() {
-        document.querySelectorAll('#move-file-list .file-item').forEach(item => item.classList.remove('selected'));
+        moveFileItems.forEach(item => item.classList.remove('selected'));
         selectedMoveTarget = null;
         createNewInMove = true;
-        document.getElementById('move-new-file').style.display = 'block';
-        document.getElementById('move-new-filename').focus();
+        moveNewFile.style.display = 'block';
+        moveNewFilename.focus();
     };
 
     window.confirmMove = function() {
-        const selected = Array.from(document.querySelectorAll('.snippet-checkbox:checked')).map(cb => cb.dataset.id);
+        const selected = Array.from(selectedIds);
         if (selected.length === 0) { alert('No snippets selected'); return; }
 
         let targetFile = selectedMoveTarget;
@@ -2811,14 +1766,13 @@ header {
 
     // Export modal
     window.openExportModal = function() {
-        const count = document.querySelectorAll('.snippet-checkbox:checked').length;
-        if (count === 0) { alert('No snippets selected'); return; }
+        if (selectedIds.size === 0) { alert('No snippets selected'); return; }
         document.getElementById('export-filename').value = 'shared-snippets';
         openModal('export-modal');
     };
 
     window.confirmExport = function() {
-        const selected = Array.from(document.querySelectorAll('.snippet-checkbox:checked')).map(cb => cb.dataset.id);
+        const selected = Array.from(selectedIds);
         const filename = document.getElementById('export-filename').value.trim() || 'shared-snippets';
 
         fetch('/export-snippets', {
@@ -2845,9 +1799,205 @@ header {
         menuDropdown.classList.remove('active');
     };
 })();
-</script>
+'''
+
+_LIST_TPL = '''{% extends "base.html" %}
+{% block content %}
+    <!-- Selection Bar -->
+    <div class="selection-bar" id="selection-bar">
+        <span class="selection-count"><span id="selected-count">0</span> selected</span>
+        <button class="btn btn-sm btn-purple" onclick="openMoveModal()">
+            <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
+                <path d="M5 12h14M12 5l7 7-7 7"/>
+            </svg>
+            Move to...
+        </button>
+        <button class="btn btn-sm btn-success" onclick="openExportModal()">
+            <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
+                <path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>
+                <polyline points="17 8 12 3 7 8"></polyline>
+                <line x1="12" y1="3" x2="12" y2="15"></line>
+            </svg>
+            Export...
+        </button>
+        <button class="btn btn-sm btn-secondary" onclick="toggleSelectionMode()">Cancel</button>
+    </div>
+
+    {% if snippets %}
+    <div class="controls-bar">
+        <select id="filter-file" class="control-select">
+            <option value="all">Collection: All files</option>
+            {% for file in unique_files %}
+            <option value="{{ file.path }}">Collection: {{ file.label }}</option>
+            {% endfor %}
+        </select>
+        <select id="sort-order" class="control-select">
+            <option value="asc">Sort: A → Z</option>
+            <option value="desc">Sort: Z → A</option>
+        </select>
+        <button id="btn-open-folder" class="btn btn-folder" title="Open folder in file manager">
+            <svg width="16" height="16" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><use href="#ico-folder"/></svg>
+            Open Folder
+        </button>
+        <span id="filtered-count" class="filtered-count"></span>
+    </div>
+
+    <div id="snippet-list"></div>
+    <script id="snippet-data" type="application/json">{{ snippet_payload }}</script>
+    <template id="card-tmpl">
+        <div class="snippet-card">
+            <div class="snippet-content">
+                <input type="checkbox" class="snippet-checkbox">
+                <div class="snippet-info">
+                    <div class="snippet-header">
+                        <span class="snippet-trigger"></span>
+                        <span class="badge badge-file"></span>
+                        <span class="badge badge-word">word</span>
+                        <span class="badge badge-case">case</span>
+                        <span class="badge badge-md">md</span>
+                    </div>
+                    <div class="snippet-preview"></div>
+                </div>
+            </div>
+            <div class="snippet-actions">
+                <a class="btn btn-icon btn-edit" onclick="event.stopPropagation();" title="Edit">
+                    <svg width="16" height="16" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><use href="#ico-edit"/></svg>
+                </a>
+                <a class="btn btn-icon btn-delete" onclick="event.stopPropagation();" title="Delete">
+                    <svg width="16" height="16" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><use href="#ico-delete"/></svg>
+                </a>
+            </div>
+        </div>
+    </template>
+    {% else %}
+        <div class="empty-state">
+            <h2>No snippets yet</h2>
+            <p>Click <strong>+ Add New</strong> to create your first snippet, or import an existing collection.</p>
+        </div>
+    {% endif %}
+
+<!-- New File Modal -->
+<div class="modal-overlay" id="new-file-modal">
+    <div class="modal">
+        <h2 class="modal-title">Create New Collection</h2>
+        <form id="new-file-form" action="/create-file" method="POST">
+            <div class="form-group">
+                <label class="form-label" for="new-filename">Collection Name</label>
+                <input type="text" id="new-filename" name="filename" class="form-input" placeholder="my-snippets" required>
+                <p style="font-size: 0.8rem; color: var(--text-muted); margin-top: 8px;">.yml extension will be added automatically</p>
+            </div>
+            <div class="modal-actions">
+                <button type="button" class="btn btn-secondary" onclick="closeModal('new-file-modal')">Cancel</button>
+                <button type="submit" class="btn btn-primary">Create</button>
+            </div>
+        </form>
+    </div>
+</div>
+
+<!-- Import Modal -->
+<div class="modal-overlay" id="import-modal">
+    <div class="modal">
+        <h2 class="modal-title">Import Collection</h2>
+        <form id="import-form" action="/import" method="POST" enctype="multipart/form-data">
+            <div class="form-group">
+                <label class="form-label">Select YAML file</label>
+                <div class="file-input-wrapper">
+                    <input type="file" id="import-file" name="file" accept=".yml,.yaml" required onchange="updateFileLabel(this)">
+                    <div class="file-input-label">
+                        <svg width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
+                            <path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"></path>
+                            <polyline points="7 10 12 15 17 10"></polyline>
+                            <line x1="12" y1="15" x2="12" y2="3"></line>
+                        </svg>
+                        <span>Click to select or drag and drop</span>
+                    </div>
+                </div>
+                <div id="selected-file-name" class="selected-file" style="display: none;"></div>
+            </div>
+            <div class="form-group">
+                <label class="form-label">Import as</label>
+                <div class="option-item" style="padding: 0;">
+                    <input type="radio" id="import-new" name="import_mode" value="new" checked>
+                    <label for="import-new">New collection (keep original filename)</label>
+                </div>
+                <div class="option-item" style="border: none;">
+                    <input type="radio" id="import-merge" name="import_mode" value="merge">
+                    <label for="import-merge">Merge into existing collection</label>
+                </div>
+                <select id="merge-target" name="merge_target" class="control-select" style="width: 100%; margin-top: 8px; display: none;">
+                    {% for file in unique_files %}
+                    <option value="{{ file.path }}">{{ file.label }}</option>
+                    {% endfor %}
+                </select>
+            </div>
+            <div class="modal-actions">
+                <button type="button" class="btn btn-secondary" onclick="closeModal('import-modal')">Cancel</button>
+                <button type="submit" class="btn btn-success">Import</button>
+            </div>
+        </form>
+    </div>
+</div>
+
+<!-- Move Modal -->
+<div class="modal-overlay" id="move-modal">
+    <div class="modal">
+        <h2 class="modal-title">Move Snippets</h2>
+        <p style="color: var(--text-secondary); margin-bottom: 16px;">Select destination collection:</p>
+        <div class="file-list" id="move-file-list">
+            {% for file in unique_files %}
+            <div class="file-item" data-path="{{ file.path }}" onclick="selectMoveTarget(this)">
+                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
+                    <path d="M14 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V8z"></path>
+                    <polyline points="14 2 14 8 20 8"></polyline>
+                </svg>
+                <div>
+                    <div class="file-item-label">{{ file.label }}</div>
+                    <div class="file-item-path">{{ file.relative }}</div>
+                </div>
+            </div>
+            {% endfor %}
+        </div>
+        <div style="margin-top: 12px;">
+            <button class="btn btn-sm btn-secondary" onclick="showNewFileInMove()">
+                <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
+                    <path d="M12 5v14M5 12h14"/>
+                </svg>
+                Create new collection
+            </button>
+        </div>
+        <div id="move-new-file" style="display: none; margin-top: 12px;">
+            <input type="text" id="move-new-filename" class="form-input" placeholder="new-collection-name">
+        </div>
+        <div class="modal-actions">
+            <button type="button" class="btn btn-secondary" onclick="closeModal('move-modal')">Cancel</button>
+            <button type="button" class="btn btn-purple" id="move-confirm-btn" onclick="confirmMove()">Move</button>
+        </div>
+    </div>
+</div>
+
+<!-- Export Modal -->
+<div class="modal-overlay" id="export-modal">
+    <div class="modal">
+        <h2 class="modal-title">Export Snippets</h2>
+        <p style="color: var(--text-secondary); margin-bottom: 16px;">Export selected snippets to a new file for sharing.</p>
+        <div class="form-group">
+            <label class="form-label" for="export-filename">Export filename</label>
+            <input type="text" id="export-filename" class="form-input" placeholder="shared-snippets" value="shared-snippets">
+            <p style="font-size: 0.8rem; color: var(--text-muted); margin-top: 8px;">.yml extension will be added automatically</p>
+        </div>
+        <div class="modal-actions">
+            <button type="button" class="btn btn-secondary" onclick="closeModal('export-modal')">Cancel</button>
+            <button type="button" class="btn btn-success" onclick="confirmExport()">Export & Download</button>
+        </div>
+    </div>
+</div>
+
+<script src="/assets/__LIST_JS__" defer></script>
+
+{% endblock %}'''
 
-{% elif view == 'edit' or view == 'new' %}
+_EDIT_TPL = '''{% extends "base.html" %}
+{% block content %}
     <a href="/" class="back-link">
         <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
             <path d="m15 18-6-6 6-6"/>
@@ -2904,42 +2054,116 @@ header {
             <a href="/" class="btn btn-secondary">Cancel</a>
         </div>
     </form>
-{% endif %}
-</main>
-</div>
-</body>
-</html>'''
+{% endblock %}'''
+
+# In-module static assets, pre-gzipped and published under content-hashed
+# names so they can be cached forever; a changed body changes the URL.
+_ASSETS = {}  # name -> (raw bytes, gzipped bytes, mimetype)
+
+def _register_asset(name_fmt, text, mime):
+    raw = text.encode("utf-8")
+    name = name_fmt % hashlib.md5(raw).hexdigest()[:10]
+    _ASSETS[name] = (raw, gzip.compress(raw, 6), mime)
+    return name
+
+_BASE_TPL = _BASE_TPL.replace("__APP_CSS__",
+                              _register_asset("app-%s.css", _APP_CSS, "text/css"))
+_LIST_TPL = _LIST_TPL.replace("__LIST_JS__",
+                              _register_asset("app-%s.js", _LIST_JS,
+                                              "application/javascript"))
+
+# The partials stay in-module (this is deliberately a single-file app)
+# but go through a DictLoader so list/edit extend the shared chrome and
+# each view only carries its own AST. auto_reload=False skips the
+# up-to-date check per render, and the bytecode cache persists compiled
+# templates in the temp dir so later process starts skip parsing too.
+_JINJA_ENV = Environment(
+    loader=DictLoader({"base.html": _BASE_TPL,
+                       "list.html": _LIST_TPL,
+                       "edit.html": _EDIT_TPL}),
+    autoescape=True,
+    auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache(),
+)
+# get_template() is cached inside the Environment; grab them once anyway.
+_LIST_PAGE = _JINJA_ENV.get_template("list.html")
+_EDIT_PAGE = _JINJA_ENV.get_template("edit.html")
+
+# Per-file shards of the list-view JSON payload, reused until the file's
+# parse cache entry changes. The browser renders the cards from this data,
+# so a warm page load costs string concatenation, not templating.
+_SHARD_CACHE = {}  # str(path) -> (st_mtime_ns, st_size, json fragment str)
+
+def _snippet_json(s):
+    return {"id": s.id, "f": s.file, "lbl": s.file_label, "t": s.trigger,
+            "p": s.preview[:80],
+            "w": s.word, "c": s.propagate_case, "md": s.is_markdown}
+
+def _render_payload(store):
+    """JSON array of list-view snippet data, one cached shard per file."""
+    shards = []
+    for fidx, path in enumerate(store.files):
+        version = _PARSE_CACHE.get(path)
+        cached = _SHARD_CACHE.get(path)
+        if cached is not None and version is not None \
+                and cached[0] == version[0] and cached[1] == version[1]:
+            shards.append(cached[2])
+            continue
+        blob = ",".join(
+            _json_dumps(_snippet_json(_SnippetView(store, row)))
+            for row in range(store.file_start[fidx], store._file_end(fidx)))
+        if version is not None:
+            _SHARD_CACHE[path] = (version[0], version[1], blob)
+        shards.append(blob)
+    body = "[" + ",".join(s for s in shards if s) + "]"
+    # '</' must not appear literally inside an inline <script> data block.
+    return Markup(body.replace("</", "<\\/"))
+
+@app.route("/assets/<name>")
+def serve_asset(name):
+    asset = _ASSETS.get(name)
+    if asset is None:
+        return "Asset not found", 404
+    raw, gz, mime = asset
+    use_gz = "gzip" in request.headers.get("Accept-Encoding", "").lower()
+    resp = app.response_class(gz if use_gz else raw, mimetype=mime)
+    if use_gz:
+        resp.headers["Content-Encoding"] = "gzip"
+        resp.headers["Vary"] = "Accept-Encoding"
+    # The name embeds a content hash, so the body for a given URL never
+    # changes and the browser may cache it indefinitely.
+    resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    resp.set_etag(name)
+    return resp.make_conditional(request)
 
 @app.route("/")
 def index():
     snippets, exists = load_snippets()
     if not exists: return "Espanso match dir not found"
 
-    unique_files_dict = {}
-    for s in snippets:
-        if s["file"] not in unique_files_dict:
-            unique_files_dict[s["file"]] = s["file_label"]
-
-    unique_files = [{"path": path, "label": label, "relative": str(Path(path).relative_to(MATCH_DIR)) if Path(path).is_relative_to(MATCH_DIR) else path} 
-                    for path, label in sorted(unique_files_dict.items(), key=lambda x: x[1].lower())]
-
-    return render_template_string(TEMPLATE, view="list", snippets=snippets,
-                                  snippet_count=len(snippets),
-                                  unique_files=unique_files,
-                                  msg=request.args.get("msg"), mt=request.args.get("mt"))
+    # Stream the render so the browser parses the head and chrome while the
+    # payload part of the template is still being produced.
+    stream = _LIST_PAGE.stream(view="list", snippets=snippets,
+                               snippet_count=len(snippets),
+                               snippet_payload=_render_payload(snippets),
+                               unique_files=snippets.unique_files(),
+                               msg=request.args.get("msg"), mt=request.args.get("mt"))
+    # No stream_with_context: everything request-bound was evaluated above,
+    # so the generator must not pin the request context until it is drained.
+    stream.enable_buffering(200)
+    return app.response_class(stream, mimetype="text/html")
 
 @app.route("/new")
 def new_snippet():
     unique_files = get_yaml_files()
-    return render_template_string(TEMPLATE, view="new", snippet=None, unique_files=unique_files)
+    return _EDIT_PAGE.render(view="new", snippet=None, unique_files=unique_files)
 
 @app.route("/edit/<path:snippet_id>")
 def edit_snippet(snippet_id):
-    snippets, _ = load_snippets()
+    store, _ = load_snippets()
     full_id = ensure_absolute_path(snippet_id)
-    snippet = next((s for s in snippets if s["id"] == full_id), None)
-    if not snippet: snippet = next((s for s in snippets if s["id"] == snippet_id), None)
-    return render_template_string(TEMPLATE, view="edit", snippet=snippet, unique_files=[])
+    snippet = store.lookup(full_id) or store.lookup(snippet_id)
+    return _EDIT_PAGE.render(view="edit", snippet=snippet, unique_files=[])
 
 @app.route("/create", methods=["POST"])
 def create():
@@ -2974,16 +2198,17 @@ def delete(snippet_id):
 
 @app.route("/open-folder", methods=["POST"])
 def open_folder_route():
+    # Validation failures return before the try: no exception machinery for
+    # expected control flow, and clients can branch on the status code.
+    filepath = (request.get_json() or {}).get("filepath", "")
+    if not filepath:
+        return jsonify({"success": False, "error": "No filepath provided"}), 400
     try:
-        data = request.get_json()
-        filepath = data.get("filepath", "")
-        if not filepath:
-            return jsonify({"success": False, "error": "No filepath provided"})
         folder_path = Path(filepath).parent
         success = open_folder(folder_path)
         return jsonify({"success": success})
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
+        return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route("/open-match-dir", methods=["POST"])
 def open_match_dir_route():
@@ -3014,18 +2239,11 @@ def import_route():
         if file.filename == '':
             return redirect(url_for("index", msg="No file selected", mt="error"))
         
-        # Save uploaded file temporarily
-        temp_path = Path("/tmp") / secure_filename(file.filename)
-        file.save(temp_path)
-        
         import_mode = request.form.get("import_mode", "new")
         merge_target = request.form.get("merge_target") if import_mode == "merge" else None
-        
-        count, target_path = import_yaml_file(temp_path, merge_target)
-        
-        # Clean up temp file
-        temp_path.unlink()
-        
+
+        count, target_path = import_yaml_file(file.stream, file.filename, merge_target)
+
         action = "merged into" if merge_target else "imported as"
         return redirect(url_for("index", msg=f"Imported {count} snippets {action} {target_path.stem}", mt="success"))
     except Exception as e:
@@ -3033,82 +2251,104 @@ def import_route():
 
 @app.route("/move-snippets", methods=["POST"])
 def move_snippets_route():
+    data = request.get_json() or {}
+    snippet_ids = data.get("snippets", [])
+    target = data.get("target", "")
+
+    if not snippet_ids:
+        return jsonify({"success": False, "error": "No snippets selected"}), 400
+
+    if not target:
+        return jsonify({"success": False, "error": "No target selected"}), 400
+
     try:
-        data = request.get_json()
-        snippet_ids = data.get("snippets", [])
-        target = data.get("target", "")
-        
-        if not snippet_ids:
-            return jsonify({"success": False, "error": "No snippets selected"})
-        
-        if not target:
-            return jsonify({"success": False, "error": "No target selected"})
-        
         # Check if creating new file
-        if target.startswith("_new_:"):
-            new_name = target[6:]
+        if target.startswith(_NEW_PREFIX):
+            new_name = target[len(_NEW_PREFIX):]
             target_path = create_new_file(new_name)
         else:
             target_path = Path(target)
         
-        # Decode snippet IDs and move them (in reverse order to handle index shifting)
-        from urllib.parse import unquote
-        decoded_ids = [unquote(sid) for sid in snippet_ids]
-        
-        # Group by file and sort by index descending
-        by_file = {}
-        for sid in decoded_ids:
+        # Group by file; the batch helper parses and writes each file once.
+        by_file = defaultdict(list)
+        for sid in map(unquote, snippet_ids):
             sid = ensure_absolute_path(sid)
             filepath, index = sid.rsplit("::", 1)
-            if filepath not in by_file:
-                by_file[filepath] = []
             by_file[filepath].append(int(index))
-        
-        # Sort indices in descending order to avoid index shifting issues
-        moved_count = 0
-        for filepath, indices in by_file.items():
-            for index in sorted(indices, reverse=True):
-                if Path(filepath) != target_path:  # Don't move to same file
-                    move_snippet(filepath, index, target_path)
-                    moved_count += 1
+
+        moved_count = move_snippets_batch(by_file, target_path)
         
         return jsonify({"success": True, "message": f"Moved {moved_count} snippet(s) to {target_path.stem}"})
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
+        return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route("/export-snippets", methods=["POST"])
 def export_snippets_route():
+    data = request.get_json() or {}
+    snippet_ids = data.get("snippets", [])
+    filename = data.get("filename", "export")
+
+    if not snippet_ids:
+        return jsonify({"success": False, "error": "No snippets selected"}), 400
+
     try:
-        data = request.get_json()
-        snippet_ids = data.get("snippets", [])
-        filename = data.get("filename", "export")
-        
-        if not snippet_ids:
-            return jsonify({"success": False, "error": "No snippets selected"})
-        
         # Decode snippet IDs
-        from urllib.parse import unquote
-        decoded_ids = [ensure_absolute_path(unquote(sid)) for sid in snippet_ids]
-        
-        # Create export file in temp directory
-        if not filename.endswith('.yml'):
-            filename += '.yml'
-        export_path = Path("/tmp") / secure_filename(filename)
-        
-        count = copy_snippets_to_file(decoded_ids, export_path)
+        decoded_ids = [ensure_absolute_path(sid) for sid in map(unquote, snippet_ids)]
         
-        return jsonify({"success": True, "filename": export_path.name, "count": count})
+        export_name = _safe_yml_name(filename)
+        count, payload = build_export(decoded_ids)
+
+        # Park the document for the follow-up download; oldest entry
+        # falls out once the bound is hit.
+        while len(_EXPORTS) >= _EXPORTS_MAX:
+            _EXPORTS.pop(next(iter(_EXPORTS)))
+        _EXPORTS[export_name] = payload
+
+        return jsonify({"success": True, "filename": export_name, "count": count})
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
+        return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route("/download-export/<filename>")
 def download_export(filename):
-    export_path = Path("/tmp") / secure_filename(filename)
-    if not export_path.exists():
+    try:
+        export_name = _safe_yml_name(filename)
+    except ValueError:
+        # A name that sanitizes to nothing can't match a parked export.
         return redirect(url_for("index", msg="Export file not found", mt="error"))
-    
-    return send_file(export_path, as_attachment=True, download_name=filename)
+    payload = _EXPORTS.get(export_name)
+    if payload is None:
+        return redirect(url_for("index", msg="Export file not found", mt="error"))
+
+    # BytesIO has no mtime for send_file to derive an ETag from, so hash
+    # the payload; repeat downloads of the same export then 304.
+    return send_file(BytesIO(payload), as_attachment=True,
+                     download_name=export_name, mimetype="application/x-yaml",
+                     conditional=True, etag=hashlib.md5(payload).hexdigest())
+
+def _launch_browser():
+    # Imports stay inside the thread so they don't delay server startup.
+    import socket
+    import time
+    import webbrowser
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", 5000), timeout=0.2).close()
+        except OSError:
+            time.sleep(0.1)
+            continue
+        webbrowser.open("http://localhost:5000")
+        return
 
 if __name__ == "__main__":
-    Timer(1.0, lambda: webbrowser.open("http://localhost:5000")).start()
-    app.run(debug=False, port=5000, host='0.0.0.0')
+    # Skip the browser pop-up in the reloader child so flipping debug on
+    # doesn't open a second window.
+    if os.environ.get("WERKZEUG_RUN_MAIN") != "true":
+        Thread(target=_launch_browser, daemon=True).start()
+    # Prefer waitress when installed: the Werkzeug dev server handles one
+    # request at a time, so a slow YAML parse blocks every other call.
+    try:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=5000, threads=8)
+    except ImportError:
+        app.run(debug=False, port=5000, host='0.0.0.0', threaded=True)